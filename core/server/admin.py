@@ -4,7 +4,7 @@ from django.contrib.auth.models import Group
 from django.utils.html import format_html
 
 from .forms import RoomForm
-from .models import History, Message, Notification, Report, Room, Tag, Topic, User
+from .models import History, Message, Notification, Preference, Recommendation, Report, Room, Tag, Topic, User
 
 
 @admin.register(User)
@@ -172,7 +172,7 @@ class NotificationAdmin(admin.ModelAdmin):
         }),
         ("Information", {
             "fields": (
-                "recipient", "content", "created_at", "is_viewed",
+                "recipient", "content", "room", "user", "message", "report", "created_at", "is_viewed",
             )
         }),
     )
@@ -198,4 +198,41 @@ class HistoryAdmin(admin.ModelAdmin):
     readonly_fields = ("recorded_at",)
 
 
+@admin.register(Preference)
+class PreferenceAdmin(admin.ModelAdmin):
+
+    list_display = ("owner", "weight", "updated_at",)
+    fieldsets = (
+        (None, {
+            "fields": (
+                "owner",
+            )
+        }),
+        ("Information", {
+            "fields": (
+                "features", "weight", "updated_at",
+            )
+        }),
+    )
+    readonly_fields = ("updated_at",)
+
+
+@admin.register(Recommendation)
+class RecommendationAdmin(admin.ModelAdmin):
+
+    list_display = ("owner", "room", "rating",)
+    fieldsets = (
+        (None, {
+            "fields": (
+                "rating",
+            )
+        }),
+        ("Information", {
+            "fields": (
+                "owner", "room",
+            )
+        }),
+    )
+
+
 admin.site.unregister(Group)
@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+class TokenCache:
+
+    def __init__(self, max_size=10000, ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._tokens = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = {
+            "hits": 0,
+            "misses": 0,
+            "evicted": 0
+        }
+
+    def _get(self, raw_token):
+        with self._lock:
+            entry = self._tokens.get(raw_token)
+
+            if entry is not None and entry[0] > time.time():
+                self._tokens.move_to_end(raw_token)
+                self._metrics["hits"] += 1
+
+                return entry[1]
+
+            if entry is not None:
+                del self._tokens[raw_token]
+
+            self._metrics["misses"] += 1
+
+        return None
+
+    def _set(self, raw_token, token):
+        expires_at = min(token["exp"], time.time() + self.ttl)
+
+        with self._lock:
+            self._tokens[raw_token] = (expires_at, token)
+            self._tokens.move_to_end(raw_token)
+
+            while len(self._tokens) > self.max_size:
+                self._tokens.popitem(last=False)
+                self._metrics["evicted"] += 1
+
+    def get_validated_token(self, raw_token):
+        token = self._get(raw_token)
+
+        if token is None:
+            token = AccessToken(raw_token)
+            self._set(raw_token, token)
+
+        return token
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
+
+    def get_metrics(self):
+        with self._lock:
+            return {**self._metrics, "size": len(self._tokens)}
+
+
+_token_cache = None
+_token_cache_lock = threading.Lock()
+
+
+def get_token_cache():
+    global _token_cache
+
+    if _token_cache is not None:
+        return _token_cache
+
+    with _token_cache_lock:
+        if _token_cache is None:
+            config = settings.TOKEN_CACHE
+            _token_cache = TokenCache(max_size=config["MAX_SIZE"], ttl=config["TTL"])
+
+    return _token_cache
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+
+    def get_validated_token(self, raw_token):
+        if isinstance(raw_token, bytes):
+            raw_token = raw_token.decode()
+
+        try:
+            return get_token_cache().get_validated_token(raw_token)
+        except TokenError as error:
+            raise InvalidToken({
+                "detail": "Given token not valid for any token type",
+                "messages": [{"token_class": AccessToken.__name__, "token_type": AccessToken.token_type,
+                              "message": error.args[0]}]
+            })
@@ -1,10 +1,14 @@
 import urllib
 
 from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
-from rest_framework.exceptions import PermissionDenied
+from django.conf import settings
+from django.db import transaction
+from rest_framework.exceptions import NotFound, PermissionDenied
 
 from .models import Room, User
+from .room_state import get_room_state_store
 from .serializers import ConnectingSerializer, DisconnectingSerializer
 from .utils import AuthorizationUtils, WebSocketUtils
 
@@ -68,12 +72,35 @@ class RoomListConsumer(AsyncJsonWebsocketConsumer):
 
         await self.accept()
 
-    async def receive_json(self, content):
-        await self.channel_layer.group_send(self.group, content)
+        await self._send_snapshot()
 
     async def disconnect(self, _):
         await self.channel_layer.group_discard(self.group, self.channel_name)
 
+    async def receive_json(self, content):
+        if content.get("type") != "room_list_snapshot":
+            return None
+
+        cursor = content.get("cursor")
+
+        if not isinstance(cursor, int) or isinstance(cursor, bool):
+            return None
+
+        await self._send_snapshot(cursor=cursor)
+
+    async def _send_snapshot(self, cursor=None):
+        rooms, next_cursor = await sync_to_async(Room.objects.get_summaries)(
+            limit=settings.WEBSOCKET_DISPATCH["ROOM_LIST_SNAPSHOT_SIZE"],
+            cursor=cursor
+        )
+
+        await self.send_json({
+            "type": "room_list_snapshot",
+            "rooms": rooms,
+            "cursor": cursor,
+            "next": next_cursor
+        })
+
     async def room_list_update(self, event):
         await self.send_json(event)
 
@@ -81,8 +108,10 @@ class RoomListConsumer(AsyncJsonWebsocketConsumer):
 class RoomConsumer(AsyncJsonWebsocketConsumer):
 
     group = None
-    kicked_users = dict()
-    voice_chat_users = dict()
+
+    @property
+    def room_state(self):
+        return get_room_state_store()
 
     async def connect(self):
         self.room = await sync_to_async(Room.objects.get_or_none)(title=self.scope["url_route"]["kwargs"]["title"])
@@ -91,96 +120,130 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
             await self.close(code=404)
             return None
 
-        self.group = f"room-{self.room.id}"
-
-        self.kicked_users[self.group] = self.kicked_users.get(self.group, set())
-        self.voice_chat_users[self.group] = self.voice_chat_users.get(self.group, dict())
+        group = f"room-{self.room.id}"
 
         token = self.scope["cookies"].get("access_token")
 
         user_id = AuthorizationUtils.get_user_id(token=token)
         self.user = user_id
 
-        if self.user is None or self.user in self.kicked_users[self.group]:
+        if self.user is None or await self.room_state.is_kicked(group, self.user):
             await self.close(code=403)
             return None
 
         query_params = urllib.parse.parse_qs(self.scope["query_string"].decode())
         key = query_params.get("key", [None])[0]
 
-        data = {
-            "user": self.user
-        }
-
-        if key is not None:
-            data["key"] = key
-
-        serializer = await sync_to_async(ConnectingSerializer)(instance=self.room, data=data)
+        await self.channel_layer.group_add(group, self.channel_name)
 
         try:
-            await sync_to_async(serializer.is_valid)()
+            await self._join(key=key)
         except PermissionDenied:
+            await self.channel_layer.group_discard(group, self.channel_name)
             await self.close(code=403)
             return None
+        except NotFound:
+            await self.channel_layer.group_discard(group, self.channel_name)
+            await self.close(code=404)
+            return None
 
-        await sync_to_async(serializer.save)()
-
-        await self.channel_layer.group_add(self.group, self.channel_name)
+        self.group = group
 
         await self.accept()
 
-        await sync_to_async(WebSocketUtils.connect_room)(room_id=self.room.id)
-        await sync_to_async(WebSocketUtils.update_room_list)()
-
     async def disconnect(self, _):
         if self.group is None:
             return None
 
-        if self.user in self.voice_chat_users[self.group]:
-            self.voice_chat_users[self.group].pop(self.user)
+        await self.room_state.remove_voice_chat_user(self.group, self.user)
+
+        if self.user == self.room.host_id:
+            await self.room_state.clear_kicked_users(self.group)
 
-        if await sync_to_async(lambda: self.user == self.room.host.id)():
-            self.kicked_users[self.group].clear()
+        try:
+            await self._leave()
+        except (PermissionDenied, NotFound):
+            return None
 
+        await self.channel_layer.group_discard(self.group, self.channel_name)
+
+    @database_sync_to_async
+    def _join(self, key):
         data = {
             "user": self.user
         }
 
-        serializer = await sync_to_async(DisconnectingSerializer)(instance=self.room, data=data)
+        if key is not None:
+            data["key"] = key
 
-        try:
-            await sync_to_async(serializer.is_valid)()
-        except PermissionDenied:
-            return None
+        with transaction.atomic():
+            self.room = Room.objects.select_for_update().select_related("topic").filter(pk=self.room.id).first()
 
-        await sync_to_async(serializer.save)()
+            if self.room is None:
+                raise NotFound("No room was found.")
 
-        await self.channel_layer.group_discard(self.group, self.channel_name)
+            serializer = ConnectingSerializer(instance=self.room, data=data)
+            serializer.is_valid()
+            serializer.save()
+
+            WebSocketUtils.connect_room(room_id=self.room.id)
+            self._update_room_list()
 
-        await sync_to_async(WebSocketUtils.disconnect_room)(room_id=self.room.id)
-        await sync_to_async(WebSocketUtils.update_room_list)()
+    @database_sync_to_async
+    def _leave(self):
+        data = {
+            "user": self.user
+        }
+
+        with transaction.atomic():
+            serializer = DisconnectingSerializer(instance=self.room, data=data)
+            serializer.is_valid()
+            serializer.save()
+
+            WebSocketUtils.disconnect_room(room_id=self.room.id)
+            self._update_room_list()
 
     async def receive_json(self, content):
         await self.channel_layer.group_send(self.group, content)
 
+    def _get_participants(self):
+        return [
+            {"id": user.id, "username": user.username, "image": user.image.url}
+            for user in sorted(self.room.participants.all(), key=lambda user: user.id != self.room.host_id)
+        ]
+
+    def _update_room_list(self):
+        participants = self._get_participants()
+
+        WebSocketUtils.update_room_list(participants=[{
+            "id": self.room.id,
+            "count_of_participants": len(participants),
+            "is_available": len(participants) < self.room.number_of_participants,
+            "participants": participants
+        }])
+
     async def room_connect(self, event):
-        event["voice_chat_users"] = list(self.voice_chat_users[self.group].values())
+        event["voice_chat_users"] = await self.room_state.get_voice_chat_users(self.group)
         await self.send_json(event)
 
     async def room_disconnect(self, event):
-        event["voice_chat_users"] = list(self.voice_chat_users[self.group].values())
+        event["voice_chat_users"] = await self.room_state.get_voice_chat_users(self.group)
         await self.send_json(event)
 
     async def room_update(self, event):
         self.room = await sync_to_async(Room.objects.get_or_none)(title=event["room"])
 
-        if "user" in event.keys() and event["user"]["id"] in self.voice_chat_users[self.group]:
-            self.voice_chat_users[self.group][event["user"]["id"]]["username"] = event["user"]["username"]
-            self.voice_chat_users[self.group][event["user"]["id"]]["image"] = event["user"]["image"]
+        if "user" in event.keys():
+            await self.room_state.update_voice_chat_user(
+                self.group,
+                event["user"]["id"],
+                username=event["user"]["username"],
+                image=event["user"]["image"]
+            )
 
             event["user"] = event["user"]["id"]
 
-        event["voice_chat_users"] = list(self.voice_chat_users[self.group].values())
+        event["voice_chat_users"] = await self.room_state.get_voice_chat_users(self.group)
 
         await self.send_json(event)
 
@@ -188,7 +251,7 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
         await self.send_json(event)
 
     async def user_kick(self, event):
-        self.kicked_users[self.group].add(event["user"])
+        await self.room_state.kick_user(self.group, event["user"])
         await self.send_json(event)
 
     async def message_send(self, event):
@@ -201,22 +264,19 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
         await self.send_json(event)
 
     async def voice_chat_connect(self, event):
-        if event["user"]["id"] not in self.voice_chat_users[self.group]:
-            self.voice_chat_users[self.group][event["user"]["id"]] = event["user"]
+        await self.room_state.add_voice_chat_user(self.group, event["user"])
 
-        event["voice_chat_users"] = list(self.voice_chat_users[self.group].values())
+        event["voice_chat_users"] = await self.room_state.get_voice_chat_users(self.group)
 
         await self.send_json(event)
 
     async def voice_chat_toggle_speaking(self, event):
-        if event["user"] in self.voice_chat_users[self.group]:
-            self.voice_chat_users[self.group][event["user"]]["is_speaking"] = event["is_speaking"]
+        await self.room_state.update_voice_chat_user(self.group, event["user"], is_speaking=event["is_speaking"])
 
         await self.send_json(event)
 
     async def voice_chat_toggle_mic(self, event):
-        if event["user"] in self.voice_chat_users[self.group]:
-            self.voice_chat_users[self.group][event["user"]]["is_muted"] = event["is_muted"]
+        await self.room_state.update_voice_chat_user(self.group, event["user"], is_muted=event["is_muted"])
 
         await self.send_json(event)
 
@@ -224,9 +284,8 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
         await self.send_json(event)
 
     async def voice_chat_disconnect(self, event):
-        if event["user"] in self.voice_chat_users[self.group]:
-            self.voice_chat_users[self.group].pop(event["user"])
+        await self.room_state.remove_voice_chat_user(self.group, event["user"])
 
-        event["voice_chat_users"] = list(self.voice_chat_users[self.group].values())
+        event["voice_chat_users"] = await self.room_state.get_voice_chat_users(self.group)
 
         await self.send_json(event)
@@ -0,0 +1,220 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import SyncToAsync, async_to_sync
+from channels.layers import InMemoryChannelLayer, get_channel_layer
+from django.conf import settings
+
+
+class EventDispatcher:
+
+    def __init__(self, batch_size=100):
+        self.batch_size = batch_size
+
+        self._loop = None
+        self._queue = None
+        self._pending = dict()
+        self._lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "enqueued": 0,
+            "delivered": 0,
+            "coalesced": 0,
+            "failed": 0,
+            "batches": 0,
+            "debounced": 0,
+            "enqueue_time": 0.0,
+            "delivery_time": 0.0,
+            "max_delivery_time": 0.0
+        }
+
+    @staticmethod
+    def _get_server_loop():
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+
+        if getattr(SyncToAsync.threadlocal, "main_event_loop_pid", None) != os.getpid():
+            return None
+
+        loop = getattr(SyncToAsync.threadlocal, "main_event_loop", None)
+
+        return loop if loop is not None and loop.is_running() else None
+
+    def _get_loop(self):
+        server_loop = self._get_server_loop()
+
+        with self._lock:
+            if self._loop is not None and not self._loop.is_closed():
+                if server_loop is None or server_loop is self._loop:
+                    return self._loop, self._queue
+
+            if server_loop is not None:
+                self._queue = asyncio.Queue()
+                self._pending = dict()
+                server_loop.call_soon_threadsafe(server_loop.create_task, self._drain(self._queue))
+                self._loop = server_loop
+
+                return self._loop, self._queue
+
+            # The in-memory layer is bound to the loop that serves the consumers, so
+            # without one to hand the events to they have to be sent in place.
+            if isinstance(get_channel_layer(), InMemoryChannelLayer):
+                return None, None
+
+            loop = asyncio.new_event_loop()
+            queue = asyncio.Queue()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.create_task(self._drain(queue))
+                loop.run_forever()
+
+            threading.Thread(target=run, name="event-dispatcher", daemon=True).start()
+            self._queue = queue
+            self._pending = dict()
+            self._loop = loop
+
+            return self._loop, self._queue
+
+    def _coalesce(self, batch):
+        events = OrderedDict()
+
+        for _, group_events in batch:
+            for group, event in group_events:
+                key = (group, json.dumps(event, sort_keys=True, default=str))
+
+                # A repeated event is sent in its last position, so the final state of the group stays the same.
+                events.pop(key, None)
+                events[key] = (group, event)
+
+        groups = OrderedDict()
+
+        for group, event in events.values():
+            groups.setdefault(group, []).append(event)
+
+        return groups
+
+    async def _send(self, channel_layer, group, events):
+        failed = 0
+
+        for event in events:
+            try:
+                await channel_layer.group_send(group, event)
+            except Exception:
+                failed += 1
+
+        return failed
+
+    async def _deliver(self, batch):
+        groups = self._coalesce(batch)
+        channel_layer = get_channel_layer()
+
+        failed = await asyncio.gather(*[
+            self._send(channel_layer, group, events) for group, events in groups.items()
+        ])
+
+        delivered_at = time.perf_counter()
+        count = sum(len(events) for events in groups.values())
+
+        with self._metrics_lock:
+            self._metrics["batches"] += 1
+            self._metrics["delivered"] += count - sum(failed)
+            self._metrics["failed"] += sum(failed)
+            self._metrics["coalesced"] += sum(len(events) for _, events in batch) - count
+
+            for enqueued_at, events in batch:
+                self._metrics["delivery_time"] += (delivered_at - enqueued_at) * len(events)
+                self._metrics["max_delivery_time"] = max(
+                    self._metrics["max_delivery_time"],
+                    delivered_at - enqueued_at
+                )
+
+    async def _drain(self, queue):
+        while True:
+            batch = [await queue.get()]
+
+            while not queue.empty() and len(batch) < self.batch_size:
+                batch.append(queue.get_nowait())
+
+            await self._deliver(batch)
+
+    def dispatch(self, events):
+        start = time.perf_counter()
+        loop, queue = self._get_loop()
+
+        if loop is None:
+            async_to_sync(self._deliver)([(start, list(events))])
+        else:
+            loop.call_soon_threadsafe(queue.put_nowait, (start, list(events)))
+
+        with self._metrics_lock:
+            self._metrics["enqueued"] += len(events)
+            self._metrics["enqueue_time"] += time.perf_counter() - start
+
+    def _debounce(self, queue, enqueued_at, group, event, window, merge):
+        key = (group, event["type"])
+        pending = self._pending
+
+        if key in pending:
+            pending_at, merged = pending[key]
+            pending[key] = (pending_at, merge(merged, event))
+
+            with self._metrics_lock:
+                self._metrics["debounced"] += 1
+
+            return None
+
+        pending[key] = (enqueued_at, event)
+
+        def flush():
+            pending_at, merged = pending.pop(key)
+            queue.put_nowait((pending_at, [(group, merged)]))
+
+        asyncio.get_running_loop().call_later(window, flush)
+
+    def debounce(self, group, event, window, merge):
+        start = time.perf_counter()
+        loop, queue = self._get_loop()
+
+        if loop is None:
+            async_to_sync(self._deliver)([(start, [(group, event)])])
+        else:
+            loop.call_soon_threadsafe(self._debounce, queue, start, group, event, window, merge)
+
+        with self._metrics_lock:
+            self._metrics["enqueued"] += 1
+            self._metrics["enqueue_time"] += time.perf_counter() - start
+
+    def get_metrics(self):
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+
+        delivered = metrics["delivered"] + metrics["failed"] + metrics["coalesced"]
+
+        metrics["average_enqueue_time"] = metrics["enqueue_time"] / max(metrics["enqueued"], 1)
+        metrics["average_delivery_time"] = metrics["delivery_time"] / max(delivered, 1)
+
+        return metrics
+
+
+_event_dispatcher = None
+_event_dispatcher_lock = threading.Lock()
+
+
+def get_event_dispatcher():
+    global _event_dispatcher
+
+    if _event_dispatcher is not None:
+        return _event_dispatcher
+
+    with _event_dispatcher_lock:
+        if _event_dispatcher is None:
+            _event_dispatcher = EventDispatcher(batch_size=settings.WEBSOCKET_DISPATCH["BATCH_SIZE"])
+
+    return _event_dispatcher
@@ -0,0 +1,601 @@
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+
+class Command(BaseCommand):
+
+    help = "Measures performance of the server components on synthetic data."
+
+    def add_arguments(self, parser):
+        parser.add_argument("target", choices=[
+            "encoding", "ratings", "batch", "neighbors", "startup", "snapshot", "quality", "messages", "dispatch",
+            "joins", "auth"
+        ])
+        parser.add_argument("--rooms", type=int, default=100000)
+        parser.add_argument("--topics", type=int, default=100)
+        parser.add_argument("--tags", type=int, default=10000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--repeat", type=int, default=10)
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--queries", type=int, default=500)
+        parser.add_argument("--history", type=int, default=20)
+        parser.add_argument("--messages", type=int, default=100000)
+
+    def _generate_rooms(self, options):
+        random.seed(options["seed"])
+
+        topics = [f"topic#{i}" for i in range(options["topics"])]
+        tags = [f"tag#{i}" for i in range(options["tags"])]
+
+        from core.server.models import Room
+
+        languages = [language for language, _ in Room.Language.choices]
+
+        return [
+            {
+                "id": i,
+                "topic": random.choice(topics),
+                "language": random.choice(languages),
+                "tags": ",".join(random.sample(tags, k=random.randint(0, 5)))
+            }
+            for i in range(options["rooms"])
+        ]
+
+    def _create_rooms(self, options, with_tags=False):
+        from core.server.models import Room, Tag, Topic, User
+
+        host = User.objects.create_user(username="benchmark", email="benchmark@virnect.ua", password="benchmark")
+        topics = Topic.objects.bulk_create([
+            Topic(title=f"topic#{i}", description="benchmark", image="topics/benchmark.svg")
+            for i in range(options["topics"])
+        ])
+
+        random.seed(options["seed"])
+        languages = [language for language, _ in Room.Language.choices]
+
+        rooms = Room.objects.bulk_create([
+            Room(host=host, title=f"room#{i}", topic=random.choice(topics), language=random.choice(languages))
+            for i in range(options["rooms"])
+        ], batch_size=1000)
+
+        if with_tags:
+            tags = [f"tag#{i}" for i in range(options["tags"])]
+
+            Tag.objects.bulk_create([
+                Tag(room=room, name=name) for room in rooms for name in random.sample(tags, k=random.randint(0, 5))
+            ], batch_size=1000)
+
+        return host, topics, rooms
+
+    def _generate_activity(self, options, rooms):
+        from django.utils import timezone
+
+        by_topic = dict()
+
+        for room in rooms:
+            by_topic.setdefault(room["topic"], []).append(room)
+
+        topics = list(by_topic)
+        now = timezone.now()
+        activity = []
+
+        for _ in range(options["users"]):
+            interests = random.sample(topics, k=min(2, len(topics)))
+            language = random.choice(rooms)["language"]
+            rows = []
+
+            for step in range(options["history"] + 1):
+                interest = interests[0] if step < options["history"] // 2 else interests[-1]
+                topic = interest if random.random() < 0.8 else random.choice(topics)
+                candidates = by_topic[topic]
+                preferred = [room for room in random.sample(candidates, k=min(10, len(candidates)))
+                             if room["language"] == language]
+
+                room = random.choice(preferred) if len(preferred) != 0 and random.random() < 0.7 else \
+                    random.choice(candidates)
+                recorded_at = now - timedelta(hours=6 * (options["history"] - step))
+
+                rows.append({**room, "recorded_at": recorded_at})
+
+            activity.append(rows)
+
+        return activity
+
+    def _measure(self, function, repeat):
+        start = time.perf_counter()
+
+        for _ in range(repeat):
+            function()
+
+        return (time.perf_counter() - start) / repeat
+
+    def _report(self, name, seconds, peak=None):
+        line = f"{name:<32}{seconds * 1000:>12.2f} ms"
+
+        if peak is not None:
+            line += f"{peak / 2 ** 20:>12.2f} MiB"
+
+        self.stdout.write(line)
+
+    def benchmark_encoding(self, options):
+        from core.server.recommendation_system import RecommendationSystem
+
+        rooms = self._generate_rooms(options)
+        recommendation_system = RecommendationSystem(n=3, rooms=[])
+
+        tracemalloc.start()
+
+        start = time.perf_counter()
+        recommendation_system.train(rooms)
+        seconds = time.perf_counter() - start
+
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        snapshot = recommendation_system.snapshot
+        matrix = snapshot.matrix
+        columns = len(snapshot.vocabulary)
+        size = matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+
+        self._report("train", seconds, peak)
+        self.stdout.write(f"{'rooms x features':<32}{len(rooms):>12} x {columns}")
+        self.stdout.write(f"{'sparse matrix':<32}{size / 2 ** 20:>12.2f} MiB")
+        self.stdout.write(f"{'dense matrix (estimated)':<32}{len(rooms) * columns * 8 / 2 ** 20:>12.2f} MiB")
+
+        history = random.sample(rooms, k=10)
+
+        start = time.perf_counter()
+        recommendation_system.get_recommendations(history)
+        self._report("get_recommendations", time.perf_counter() - start)
+
+    def benchmark_batch(self, options):
+        from core.server.recommendation_system import RecommendationSystem
+
+        rooms = self._generate_rooms(options)
+        recommendation_system = RecommendationSystem(n=3, rooms=rooms)
+
+        histories = [random.sample(rooms, k=10) for _ in range(options["users"])]
+
+        start = time.perf_counter()
+        single = [recommendation_system.get_recommendations(history) for history in histories]
+        seconds = time.perf_counter() - start
+
+        self._report("get_recommendations", seconds)
+        self.stdout.write(f"{'users per second':<32}{len(histories) / seconds:>12.0f}")
+
+        start = time.perf_counter()
+        batch = recommendation_system.get_batch_recommendations(histories)
+        seconds = time.perf_counter() - start
+
+        self._report("get_batch_recommendations", seconds)
+        self.stdout.write(f"{'users per second':<32}{len(histories) / seconds:>12.0f}")
+        agreement = sum(x == y for x, y in zip(single, batch)) / len(histories)
+        self.stdout.write(f"{'agreement (ties may differ)':<32}{agreement:>12.2%}")
+
+    def benchmark_neighbors(self, options):
+        import numpy as np
+
+        from core.server.neighbors import BACKENDS
+        from core.server.recommendation_system import RecommendationSystem
+
+        rooms = self._generate_rooms(options)
+        queries = random.sample(rooms, k=options["queries"])
+
+        reference = None
+
+        for backend in BACKENDS:
+            recommendation_system = RecommendationSystem(n=3, rooms=[], backend=backend)
+
+            start = time.perf_counter()
+            recommendation_system.train(rooms)
+            self._report(f"{backend} (train)", time.perf_counter() - start)
+
+            snapshot = recommendation_system.snapshot
+            matrix = snapshot.matrix
+            norms = np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel()
+
+            query = recommendation_system._prepare_data(
+                recommendation_system._collect_data(queries),
+                snapshot.vocabulary
+            ) @ snapshot.scaling
+            query_norms = np.asarray(query.multiply(query).sum(axis=1)).ravel()
+
+            start = time.perf_counter()
+            _, indices = snapshot.model.kneighbors(query, n_neighbors=snapshot.model.n_neighbors)
+            self._report(f"{backend} (query)", (time.perf_counter() - start) / len(queries))
+
+            products = np.vstack([
+                np.asarray((matrix[row] @ query[i].T).todense()).ravel() for i, row in enumerate(indices)
+            ])
+            distances = np.sqrt(np.maximum(norms[indices] + query_norms[:, None] - 2 * products, 0))
+
+            if reference is None:
+                reference = distances.max(axis=1)
+
+            recall = (distances <= reference[:, None] + 1e-9).mean()
+            self.stdout.write(f"{backend + ' (recall@n)':<32}{recall:>12.2%}")
+
+    def benchmark_snapshot(self, options):
+        import numpy as np
+
+        from core.server.recommendation_system import RecommendationSystem
+
+        rooms = self._generate_rooms(options)
+        recommendation_system = RecommendationSystem(n=3, rooms=[])
+
+        start = time.perf_counter()
+        recommendation_system.train(rooms)
+        self._report("train", time.perf_counter() - start)
+
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            recommendation_system.save(directory)
+            self._report("save", time.perf_counter() - start)
+
+            loaded = RecommendationSystem(n=3, rooms=[])
+
+            start = time.perf_counter()
+            loaded.load(directory)
+            self._report("load", time.perf_counter() - start)
+
+            matrix = loaded.snapshot.matrix
+            memory_mapped = all(
+                getattr(array, "base", None) is not None and not array.flags.writeable
+                for array in (matrix.data, matrix.indices, matrix.indptr)
+            )
+
+            self.stdout.write(f"{'memory mapped':<32}{str(memory_mapped):>12}")
+
+            fitted = getattr(loaded.snapshot.model, "_matrix", None)
+            shared = fitted is not None and all(
+                np.shares_memory(getattr(fitted, name), getattr(matrix, name))
+                for name in ("data", "indices", "indptr")
+            )
+
+            self.stdout.write(f"{'model shares snapshot':<32}{str(shared):>12}")
+
+            history = random.sample(rooms, k=10)
+            same = loaded.get_recommendations(history) == recommendation_system.get_recommendations(history)
+
+            self.stdout.write(f"{'identical recommendations':<32}{str(same):>12}")
+
+            start = time.perf_counter()
+            loaded.update_room(rooms[0])
+            self._report("first update after load", time.perf_counter() - start)
+
+    def benchmark_startup(self, options):
+        script = "\n".join([
+            "import json, os, sys, time",
+            "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')",
+            "timings = {}",
+            "start = time.perf_counter()",
+            "from core.asgi import application",
+            "timings['asgi application'] = time.perf_counter() - start",
+            "timings['sklearn loaded'] = 'sklearn' in sys.modules",
+            "start = time.perf_counter()",
+            "from core.server.recommendation_system import get_recommendation_system",
+            "timings['recommender import'] = time.perf_counter() - start",
+            "start = time.perf_counter()",
+            "get_recommendation_system()",
+            "timings['recommender first use'] = time.perf_counter() - start",
+            "print(json.dumps(timings))",
+        ])
+
+        results = []
+
+        for _ in range(options["repeat"]):
+            output = subprocess.run(
+                [sys.executable, "-c", script],
+                capture_output=True,
+                check=True,
+                cwd=os.getcwd(),
+                text=True
+            ).stdout
+            results.append(json.loads(output.splitlines()[-1]))
+
+        for name, value in results[0].items():
+            if isinstance(value, bool):
+                self.stdout.write(f"{name:<32}{str(value):>12}")
+            else:
+                self._report(name, sorted(result[name] for result in results)[len(results) // 2])
+
+    def benchmark_ratings(self, options):
+        from django.db.models import Case, IntegerField, Value, When
+
+        from core.server.models import Recommendation
+        from core.server.views import RoomListView
+
+        with transaction.atomic():
+            user, _, rooms = self._create_rooms(options)
+
+            ratings = {room.id: random.randint(0, 3) for room in rooms}
+
+            Recommendation.objects.bulk_create([
+                Recommendation(owner=user, room_id=room_id, rating=rating)
+                for room_id, rating in ratings.items() if rating > 0
+            ], batch_size=1000)
+
+            view = RoomListView()
+            view.request = SimpleNamespace(user=user)
+
+            queries = {
+                "case": view.queryset.all().annotate(
+                    recommendation_rating=Case(
+                        *[When(id=room_id, then=Value(room_rating)) for room_id, room_rating in ratings.items()],
+                        output_field=IntegerField(),
+                    )
+                ).order_by("-recommendation_rating", "-created_at"),
+                "join": view.get_queryset()
+            }
+
+            for name, queryset in queries.items():
+                sql, params = queryset.query.sql_with_params()
+
+                self.stdout.write(f"{name}: {len(sql)} characters of SQL, {len(params)} parameters")
+                self.stdout.write(queryset.explain())
+
+                seconds = self._measure(lambda: list(queryset.all()[:5]), options["repeat"])
+                self._report(f"{name} (first page)", seconds)
+
+            transaction.set_rollback(True)
+
+    def benchmark_quality(self, options):
+        from core.server.models import History, Preference, User
+        from core.server.recommendation_system import RecommendationSystem, get_rooms_data
+        from core.server.workers import RecommendationWorker
+
+        with transaction.atomic():
+            self._create_rooms(options, with_tags=True)
+
+            tracemalloc.start()
+
+            start = time.perf_counter()
+            rooms = get_rooms_data()
+            recommendation_system = RecommendationSystem(n=3, rooms=rooms)
+            seconds = time.perf_counter() - start
+
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            self._report("train", seconds, peak)
+
+            activity = self._generate_activity(options, rooms)
+            users = User.objects.bulk_create([
+                User(username=f"user#{i}", email=f"user#{i}@virnect.ua") for i in range(len(activity))
+            ], batch_size=1000)
+
+            History.objects.bulk_create([
+                History(owner=user, topic=row["topic"], tags=row["tags"], language=row["language"])
+                for user, rows in zip(users, activity) for row in rows[:-1]
+            ], batch_size=1000)
+
+            start = time.perf_counter()
+            RecommendationWorker(workers=0)._get_preferences([user.id for user in users])
+            self._report("preferences (from history)", time.perf_counter() - start)
+
+            Preference.objects.all().delete()
+            profiles = []
+
+            for rows in activity:
+                preference = Preference()
+
+                for row in rows[:-1]:
+                    preference.add(topic=row["topic"], language=row["language"], tags=row["tags"],
+                                   recorded_at=row["recorded_at"])
+
+                profiles.append(preference.get_profile())
+
+            start = time.perf_counter()
+            single = [recommendation_system.get_profile_recommendations(profile) for profile in profiles]
+            seconds = time.perf_counter() - start
+
+            self._report("single (per user)", seconds / len(profiles))
+
+            batch_size = settings.RECOMMENDATION_SYSTEM["BATCH_SIZE"]
+
+            tracemalloc.start()
+
+            start = time.perf_counter()
+            batch = [
+                ratings
+                for i in range(0, len(profiles), batch_size)
+                for ratings in recommendation_system.get_batch_profile_recommendations(profiles[i:i + batch_size])
+            ]
+            seconds = time.perf_counter() - start
+
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            self._report("batch (per user)", seconds / len(profiles), peak)
+            self.stdout.write(f"{'users per second':<32}{len(profiles) / seconds:>12.0f}")
+
+            start = time.perf_counter()
+            votes = recommendation_system.get_batch_recommendations([rows[-2::-1] for rows in activity])
+            self._report("history votes (per user)", (time.perf_counter() - start) / len(profiles))
+
+            topics = {room["id"]: room["topic"] for room in rooms}
+
+            for name, results in (("profile", batch), ("history votes", votes)):
+                hits = sum(rows[-1]["id"] in ratings for rows, ratings in zip(activity, results))
+                topic_hits = sum(
+                    rows[-1]["topic"] in {topics[room_id] for room_id in ratings}
+                    for rows, ratings in zip(activity, results)
+                )
+
+                self.stdout.write(f"{name + ' (hit rate)':<32}{hits / len(activity):>12.2%}")
+                self.stdout.write(f"{name + ' (topic hit rate)':<32}{topic_hits / len(activity):>12.2%}")
+
+            agreement = sum(x == y for x, y in zip(single, batch)) / len(profiles)
+            self.stdout.write(f"{'single/batch agreement':<32}{agreement:>12.2%}")
+
+            transaction.set_rollback(True)
+
+    def benchmark_messages(self, options):
+        from rest_framework.test import APIRequestFactory, force_authenticate
+
+        from core.server.models import Message
+        from core.server.pagination import KeysetPagination
+        from core.server.views import MessageListView
+
+        factory = APIRequestFactory()
+        view = MessageListView.as_view()
+
+        with transaction.atomic():
+            user, _, rooms = self._create_rooms({**options, "rooms": 3})
+
+            for room, size in zip(rooms, (options["messages"] // 100, options["messages"] // 10, options["messages"])):
+                Message.objects.bulk_create([
+                    Message(room=room, author=user, text=f"message#{i}") for i in range(size)
+                ], batch_size=1000)
+
+                middle = Message.objects.filter(room=room).order_by("created_at", "id")[size // 2]
+                cursor = KeysetPagination()._encode_cursor(middle)
+
+                def get(**params):
+                    request = factory.get("/", data=params, format="json", SERVER_NAME=settings.ALLOWED_HOSTS[0])
+                    force_authenticate(request=request, user=user)
+
+                    response = view(request, room=room.title)
+                    response.render()
+
+                    return response
+
+                self.stdout.write(f"{size} messages")
+                self._report("latest page", self._measure(get, options["repeat"]))
+                self._report("page in the middle", self._measure(lambda: get(before=cursor), options["repeat"]))
+
+                if size <= 10000:
+                    self._report("whole history", self._measure(lambda: get(no_pagination=True), 1))
+
+            transaction.set_rollback(True)
+
+    def benchmark_dispatch(self, options):
+        from django.test import override_settings
+
+        from core.server.dispatcher import get_event_dispatcher
+        from core.server.utils import WebSocketUtils
+
+        def send():
+            WebSocketUtils.update_room(room_id=1, room_title="benchmark")
+            WebSocketUtils.update_room_list()
+
+        for mode in ("sync", "background"):
+            with override_settings(WEBSOCKET_DISPATCH={**settings.WEBSOCKET_DISPATCH, "MODE": mode}):
+                self._report(f"{mode} (per request)", self._measure(send, options["queries"]))
+
+        dispatcher = get_event_dispatcher()
+
+        while True:
+            metrics = dispatcher.get_metrics()
+
+            if sum(metrics[name] for name in ("delivered", "failed", "coalesced", "debounced")) >= metrics["enqueued"]:
+                break
+
+            time.sleep(0.01)
+
+        self._report("average enqueue", metrics["average_enqueue_time"])
+        self._report("average delivery", metrics["average_delivery_time"])
+        self._report("max delivery", metrics["max_delivery_time"])
+
+        for name in ("enqueued", "delivered", "coalesced", "debounced", "failed", "batches"):
+            self.stdout.write(f"{name:<32}{metrics[name]:>12}")
+
+    def benchmark_joins(self, options):
+        import asyncio
+        from urllib.parse import quote
+
+        from asgiref.sync import async_to_sync
+        from channels.testing import WebsocketCommunicator
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        from core.asgi import application
+        from core.server.models import Topic, User
+
+        # The consumers commit their own transactions, so only the rows created here are deleted afterwards.
+        with transaction.atomic():
+            host, topics, rooms = self._create_rooms({**options, "rooms": (options["users"] + 9) // 10})
+            users = User.objects.bulk_create([
+                User(username=f"joiner#{i}", email=f"joiner#{i}@virnect.ua") for i in range(options["users"])
+            ], batch_size=1000)
+
+        try:
+            communicators = [
+                WebsocketCommunicator(
+                    application,
+                    f"/ws/room/{quote(rooms[i // 10].title)}/",
+                    headers=[(b"cookie", f"access_token={AccessToken.for_user(user)}".encode())]
+                )
+                for i, user in enumerate(users)
+            ]
+
+            async def storm(method):
+                start = time.perf_counter()
+                results = await asyncio.gather(*[
+                    getattr(communicator, method)(timeout=600) for communicator in communicators
+                ])
+
+                return time.perf_counter() - start, results
+
+            async def run():
+                return await storm("connect"), await storm("disconnect")
+
+            (connect_seconds, results), (disconnect_seconds, _) = async_to_sync(run)()
+            connected = sum(connected for connected, _ in results)
+
+            self._report("connect storm", connect_seconds)
+            self.stdout.write(f"{'connected':<32}{connected:>12}")
+            self.stdout.write(f"{'connects per second':<32}{len(communicators) / connect_seconds:>12.0f}")
+
+            self._report("disconnect storm", disconnect_seconds)
+            self.stdout.write(f"{'disconnects per second':<32}{len(communicators) / disconnect_seconds:>12.0f}")
+        finally:
+            User.objects.filter(id__in=[user.id for user in users]).delete()
+            host.delete()
+            Topic.objects.filter(id__in=[topic.id for topic in topics]).delete()
+
+    def benchmark_auth(self, options):
+        from rest_framework_simplejwt.authentication import JWTAuthentication
+        from rest_framework_simplejwt.serializers import TokenVerifySerializer
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        from core.server.authentication import CachedJWTAuthentication, get_token_cache
+
+        random.seed(options["seed"])
+
+        tokens = [str(AccessToken.for_user(SimpleNamespace(id=i))) for i in range(options["users"])]
+        requests = [random.choice(tokens) for _ in range(options["queries"])]
+
+        def verify():
+            for token in requests:
+                TokenVerifySerializer(data={"token": token}).is_valid()
+                JWTAuthentication().get_validated_token(token.encode())
+
+        cache = get_token_cache()
+        cache.clear()
+
+        def verify_cached():
+            for token in requests:
+                cache.get_validated_token(token)
+                CachedJWTAuthentication().get_validated_token(token.encode())
+
+        self._report("decode per request", self._measure(verify, options["repeat"]) / len(requests))
+        self._report("cached per request", self._measure(verify_cached, options["repeat"]) / len(requests))
+
+        metrics = cache.get_metrics()
+
+        self.stdout.write(f"{'hit rate':<32}{metrics['hits'] / max(metrics['hits'] + metrics['misses'], 1):>12.2%}")
+
+    def handle(self, *args, **options):
+        getattr(self, f"benchmark_{options['target']}")(options)
@@ -0,0 +1,33 @@
+import asyncio
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+
+    help = "Runs the worker which purges notifications older than their retention period."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, help="Seconds between purges.")
+        parser.add_argument("--batch-size", type=int, help="Number of notifications deleted by one query.")
+        parser.add_argument("--once", action="store_true", help="Purge expired notifications once and exit.")
+
+    def _report(self, metrics):
+        types = ", ".join(f"{label}: {count}" for label, count in metrics["types"].items())
+
+        self.stdout.write(
+            f"{metrics['purged']} notifications have been purged in {metrics['batches']} batches "
+            f"and {metrics['seconds']:.2f} s ({types})."
+        )
+
+    def handle(self, *args, **options):
+        from core.server.workers import RetentionWorker
+
+        worker = RetentionWorker(interval=options["interval"], batch_size=options["batch_size"])
+
+        if options["once"]:
+            self._report(worker.purge())
+
+            return None
+
+        asyncio.run(worker.run(report=self._report))
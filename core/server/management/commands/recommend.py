@@ -0,0 +1,35 @@
+import asyncio
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+
+    help = "Runs the worker which precomputes room recommendations for active users."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, help="Seconds between full recomputations.")
+        parser.add_argument("--delay", type=float, help="Seconds to wait for more change events before updating.")
+        parser.add_argument("--workers", type=int, help="Number of threads computing recommendations.")
+        parser.add_argument("--batch-size", type=int, help="Number of users scored by one neighbor query.")
+        parser.add_argument("--once", action="store_true", help="Recompute recommendations once and exit.")
+
+    def handle(self, *args, **options):
+        from core.server.workers import RecommendationWorker
+
+        worker = RecommendationWorker(
+            interval=options["interval"],
+            delay=options["delay"],
+            workers=options["workers"],
+            batch_size=options["batch_size"]
+        )
+
+        if options["once"]:
+            worker.train()
+            count = worker.update_users()
+
+            self.stdout.write(f"Recommendations have been updated for {count} users.")
+
+            return None
+
+        asyncio.run(worker.run())
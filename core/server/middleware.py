@@ -1,8 +1,9 @@
 from django.contrib.auth import logout
 from django.middleware.csrf import CsrfViewMiddleware
 from rest_framework_simplejwt.exceptions import TokenError
-from rest_framework_simplejwt.serializers import TokenRefreshSerializer, TokenVerifySerializer
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 
+from core.server.authentication import get_token_cache
 from core.server.utils import AuthorizationUtils
 from core.urls import urlpatterns
 
@@ -54,12 +55,8 @@ class AuthorizationMiddleware:
 
             access = serializer.data["access"]
 
-        data = {
-            "token": access
-        }
-
         try:
-            TokenVerifySerializer(data=data).is_valid()
+            get_token_cache().get_validated_token(access)
             request.META["HTTP_AUTHORIZATION"] = f"Bearer {access}"
         except TokenError:
             return AuthorizationUtils.get_invalid_token_response(request=request)
@@ -0,0 +1,152 @@
+# Generated by Django 4.1.7 on 2026-10-18 12:57
+
+import core.server.utils
+from django.conf import settings
+import django.contrib.auth.validators
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('password', models.CharField(max_length=128, verbose_name='password')),
+                ('last_login', models.DateTimeField(blank=True, null=True, verbose_name='last login')),
+                ('is_superuser', models.BooleanField(default=False, help_text='Designates that this user has all permissions without explicitly assigning them.', verbose_name='superuser status')),
+                ('username', models.CharField(error_messages={'unique': 'A user with that username already exists.'}, help_text='Required. 150 characters or fewer. Letters, digits and @/./+/-/_ only.', max_length=150, unique=True, validators=[django.contrib.auth.validators.UnicodeUsernameValidator()], verbose_name='username')),
+                ('first_name', models.CharField(blank=True, max_length=150, verbose_name='first name')),
+                ('last_name', models.CharField(blank=True, max_length=150, verbose_name='last name')),
+                ('is_staff', models.BooleanField(default=False, help_text='Designates whether the user can log into this admin site.', verbose_name='staff status')),
+                ('is_active', models.BooleanField(default=True, help_text='Designates whether this user should be treated as active. Unselect this instead of deleting accounts.', verbose_name='active')),
+                ('date_joined', models.DateTimeField(default=django.utils.timezone.now, verbose_name='date joined')),
+                ('email', models.EmailField(max_length=150, unique=True)),
+                ('last_seen', models.DateTimeField(blank=True, null=True)),
+                ('image', models.FileField(default=core.server.utils.ImageUtils.get_default_avatar, upload_to=core.server.utils.ImageUtils.upload_image_to, validators=[core.server.utils.ImageUtils.validate_image_file_extension])),
+                ('about', models.TextField(blank=True, max_length=1024)),
+                ('groups', models.ManyToManyField(blank=True, help_text='The groups this user belongs to. A user will get all permissions granted to each of their groups.', related_name='user_set', related_query_name='user', to='auth.group', verbose_name='groups')),
+                ('user_permissions', models.ManyToManyField(blank=True, help_text='Specific permissions for this user.', related_name='user_set', related_query_name='user', to='auth.permission', verbose_name='user permissions')),
+            ],
+            options={
+                'db_table': 'user',
+            },
+        ),
+        migrations.CreateModel(
+            name='Topic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=64, unique=True)),
+                ('description', models.TextField(max_length=256)),
+                ('image', models.FileField(upload_to=core.server.utils.ImageUtils.upload_image_to, validators=[core.server.utils.ImageUtils.validate_image_file_extension])),
+            ],
+            options={
+                'db_table': 'topic',
+                'ordering': ['-title'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Room',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=64, unique=True)),
+                ('language', models.CharField(choices=[('AE', 'Arabic'), ('CN', 'Chinese'), ('GB', 'English'), ('FR', 'French'), ('DE', 'German'), ('IN', 'Hindi'), ('UN', 'International'), ('IT', 'Italian'), ('JP', 'Japanese'), ('KR', 'Korean'), ('PL', 'Polish'), ('ES', 'Spanish'), ('TR', 'Turkish'), ('UA', 'Ukrainian')], default='UN', max_length=2)),
+                ('number_of_participants', models.PositiveSmallIntegerField(default=10, validators=[django.core.validators.MinValueValidator(2), django.core.validators.MaxValueValidator(10)])),
+                ('key', models.CharField(blank=True, max_length=16)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('host', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='host', to=settings.AUTH_USER_MODEL)),
+                ('participants', models.ManyToManyField(blank=True, related_name='participants', to=settings.AUTH_USER_MODEL)),
+                ('topic', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='server.topic')),
+            ],
+            options={
+                'db_table': 'room',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Report',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reason', models.IntegerField(choices=[(0, 'Text abuse'), (1, 'Voice abuse'), (2, 'Offensive name'), (3, 'Inappropriate avatar'), (4, 'Inappropriate room name'), (5, 'Inappropriate room tags'), (6, 'Disrespectful behavior'), (7, 'Threats')])),
+                ('verdict', models.IntegerField(choices=[(0, 'No verdict'), (1, 'Blocking'), (2, 'Warning')], default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('is_viewed', models.BooleanField(default=False)),
+                ('accused', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='accused', to=settings.AUTH_USER_MODEL)),
+                ('reviewed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reviewed_by', to=settings.AUTH_USER_MODEL)),
+                ('sender', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sender', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'report',
+                'ordering': ['is_viewed', '-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('notification_type', models.IntegerField(choices=[(0, 'Mention'), (1, 'Report'), (2, 'Warning'), (3, 'Message reply'), (4, 'Status change')])),
+                ('content', models.TextField(max_length=128)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('is_viewed', models.BooleanField(default=False)),
+                ('recipient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'notification',
+                'ordering': ['is_viewed', '-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Message',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField(max_length=512)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(blank=True, null=True)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('reply_to', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='server.message')),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='server.room')),
+            ],
+            options={
+                'db_table': 'message',
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='History',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('topic', models.CharField(max_length=64)),
+                ('tags', models.CharField(max_length=64)),
+                ('language', models.CharField(max_length=32)),
+                ('recorded_at', models.DateTimeField(auto_now_add=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'history',
+                'ordering': ['-recorded_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=16)),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='server.room')),
+            ],
+            options={
+                'db_table': 'tag',
+                'ordering': ['name'],
+                'unique_together': {('room', 'name')},
+            },
+        ),
+    ]
@@ -0,0 +1,85 @@
+import json
+
+from django.db import migrations, models
+
+TARGETS = {
+    0: ("room", "user"),
+    1: ("report",),
+    2: ("report",),
+    3: ("room", "user", "message"),
+}
+
+
+def get_missing_targets():
+    query = models.Q(pk__in=[])
+
+    for notification_type, fields in TARGETS.items():
+        missing = models.Q()
+
+        for field in fields:
+            missing |= models.Q(**{f"{field}__isnull": True})
+
+        query |= models.Q(notification_type=notification_type) & missing
+
+    return query
+
+
+def backfill_notification_targets(apps, schema_editor, batch_size=1000):
+    Notification = apps.get_model("server", "Notification")
+
+    fields = ("room", "user", "message", "report")
+    last_id = 0
+
+    while True:
+        notifications = list(
+            Notification.objects.filter(get_missing_targets(), id__gt=last_id).order_by("id")[:batch_size]
+        )
+
+        if len(notifications) == 0:
+            break
+
+        contents = dict()
+
+        for notification in notifications:
+            try:
+                content = json.loads(notification.content)
+            except ValueError:
+                content = dict()
+
+            contents[notification.id] = content if isinstance(content, dict) else dict()
+
+        existing = dict()
+
+        for field in fields:
+            ids = {content[field] for content in contents.values() if isinstance(content.get(field), int)}
+            model = Notification._meta.get_field(field).related_model
+            existing[field] = set(model.objects.filter(pk__in=ids).values_list("id", flat=True)) \
+                if len(ids) != 0 else set()
+
+        for notification in notifications:
+            content = contents[notification.id]
+
+            for field in fields:
+                target = content.pop(field, None)
+
+                if getattr(notification, f"{field}_id") is None and target in existing[field]:
+                    setattr(notification, f"{field}_id", target)
+
+            notification.content = json.dumps(content)
+
+        Notification.objects.bulk_update(notifications, fields=[*fields, "content"])
+
+        last_id = notifications[-1].id
+
+    Notification.objects.filter(get_missing_targets()).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('server', '0002_notification_targets'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_notification_targets, migrations.RunPython.noop),
+    ]
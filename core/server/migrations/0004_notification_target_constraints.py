@@ -0,0 +1,25 @@
+# Generated by Django 4.1.7 on 2026-10-18 12:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('server', '0003_backfill_notification_targets'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('notification_type', 0), _negated=True), models.Q(('room__isnull', False), ('user__isnull', False)), _connector='OR'), name='notification_mention_targets'),
+        ),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('notification_type__in', [1, 2]), _negated=True), ('report__isnull', False), _connector='OR'), name='notification_report_targets'),
+        ),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('notification_type', 3), _negated=True), models.Q(('message__isnull', False), ('room__isnull', False), ('user__isnull', False)), _connector='OR'), name='notification_message_reply_targets'),
+        ),
+    ]
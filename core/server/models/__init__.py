@@ -1,6 +1,8 @@
 from .history import History
 from .message import Message
 from .notification import Notification
+from .preference import Preference
+from .recommendation import Recommendation
 from .report import Report
 from .room import Room
 from .tag import Tag
@@ -31,4 +31,7 @@ class Message(BaseModel):
 
     class Meta:
         db_table = "message"
-        ordering = ["created_at"]
+        ordering = ["created_at", "id"]
+        indexes = [
+            models.Index(fields=["room", "created_at", "id"], name="message_room_created_at_idx")
+        ]
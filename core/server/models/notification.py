@@ -1,9 +1,40 @@
+from functools import reduce
+from operator import and_
+
 from django.db import models
 
-from .base import BaseModel
+from .base import BaseManager, BaseModel
+from .message import Message
+from .report import Report
+from .room import Room
 from .user import User
 
 
+class NotificationManager(BaseManager):
+
+    def get_unread_counts(self, recipients):
+        counts = {recipient: 0 for recipient in recipients}
+
+        unread = self.filter(recipient__in=counts.keys(), is_viewed=False).values("recipient")
+
+        for row in unread.annotate(count=models.Count("id")).order_by():
+            counts[row["recipient"]] = row["count"]
+
+        return counts
+
+    def get_unread_count(self, recipient):
+        return self.filter(recipient=recipient, is_viewed=False).count()
+
+    def _get_target_checks(self):
+        return [constraint.check for constraint in self.model._meta.constraints]
+
+    def with_targets(self):
+        return self.filter(*self._get_target_checks())
+
+    def without_targets(self):
+        return self.exclude(reduce(and_, self._get_target_checks()))
+
+
 class Notification(BaseModel):
 
     class NotificationType(models.IntegerChoices):
@@ -15,13 +46,43 @@ class Notification(BaseModel):
 
     recipient = models.ForeignKey(User, on_delete=models.CASCADE)
     notification_type = models.IntegerField(choices=NotificationType.choices)
-    content = models.TextField(max_length=128)
+    content = models.TextField(max_length=128, blank=True, default="{}")
+    room = models.ForeignKey(Room, on_delete=models.CASCADE, null=True, blank=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+", null=True, blank=True)
+    message = models.ForeignKey(Message, on_delete=models.CASCADE, null=True, blank=True)
+    report = models.ForeignKey(Report, on_delete=models.CASCADE, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     is_viewed = models.BooleanField(default=False)
 
+    objects = NotificationManager()
+
     def __str__(self):
         return self.NotificationType.choices[self.notification_type][1]
 
     class Meta:
         db_table = "notification"
         ordering = ["is_viewed", "-created_at"]
+        indexes = [
+            models.Index(fields=["notification_type", "created_at"], name="notification_type_created_idx"),
+            models.Index(
+                fields=["recipient", "is_viewed"],
+                condition=models.Q(is_viewed=False),
+                name="notification_unread_idx"
+            )
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=~models.Q(notification_type=0) | models.Q(room__isnull=False, user__isnull=False),
+                name="notification_mention_targets"
+            ),
+            models.CheckConstraint(
+                check=~models.Q(notification_type__in=[1, 2]) | models.Q(report__isnull=False),
+                name="notification_report_targets"
+            ),
+            models.CheckConstraint(
+                check=~models.Q(notification_type=3) | models.Q(
+                    room__isnull=False, user__isnull=False, message__isnull=False
+                ),
+                name="notification_message_reply_targets"
+            )
+        ]
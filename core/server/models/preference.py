@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.db import models
+
+from .base import BaseManager, BaseModel
+from .history import History
+from .user import User
+
+
+class PreferenceManager(BaseManager):
+
+    def seed_from_histories(self, preferences):
+        preferences = {preference.owner_id: preference for preference in preferences}
+
+        if len(preferences) == 0:
+            return preferences
+
+        histories = History.objects.filter(owner__in=preferences.keys()).order_by("recorded_at")
+
+        for row in histories.values("owner", "topic", "tags", "language", "recorded_at"):
+            preferences[row.pop("owner")].add(**row)
+
+        return preferences
+
+
+class Preference(BaseModel):
+
+    owner = models.OneToOneField(User, on_delete=models.CASCADE)
+    features = models.JSONField(default=dict, blank=True)
+    weight = models.FloatField(default=0)
+    updated_at = models.DateTimeField(null=True, blank=True)
+
+    objects = PreferenceManager()
+
+    def _get_decay(self, recorded_at):
+        if self.updated_at is None:
+            return 1.0
+
+        half_life = settings.RECOMMENDATION_SYSTEM["HALF_LIFE"].total_seconds()
+        elapsed = max((recorded_at - self.updated_at).total_seconds(), 0)
+
+        return 0.5 ** (elapsed / half_life)
+
+    def add(self, topic, language, tags, recorded_at):
+        decay = self._get_decay(recorded_at)
+        threshold = settings.RECOMMENDATION_SYSTEM["MIN_PREFERENCE_WEIGHT"]
+
+        self.features = {
+            feature: weight * decay for feature, weight in self.features.items() if weight * decay >= threshold
+        }
+        self.weight = self.weight * decay + 1
+
+        for feature in (f"topic:{topic}", f"language:{language}", *[f"tags:{tag}" for tag in tags.split(",") if tag]):
+            self.features[feature] = self.features.get(feature, 0) + 1
+
+        self.updated_at = max(recorded_at, self.updated_at or recorded_at)
+
+    def get_profile(self):
+        if self.weight == 0:
+            return dict()
+
+        return {tuple(feature.split(":", 1)): weight / self.weight for feature, weight in self.features.items()}
+
+    def __str__(self):
+        return self.owner.username
+
+    class Meta:
+        db_table = "preference"
@@ -0,0 +1,20 @@
+from django.db import models
+
+from .base import BaseModel
+from .room import Room
+from .user import User
+
+
+class Recommendation(BaseModel):
+
+    owner = models.ForeignKey(User, on_delete=models.CASCADE)
+    room = models.ForeignKey(Room, on_delete=models.CASCADE)
+    rating = models.PositiveSmallIntegerField()
+
+    def __str__(self):
+        return f"{self.room} ({self.rating})"
+
+    class Meta:
+        db_table = "recommendation"
+        unique_together = (("owner", "room",))
+        ordering = ["-rating"]
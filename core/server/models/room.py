@@ -2,11 +2,39 @@ from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
-from .base import BaseModel
+from .base import BaseManager, BaseModel
 from .topic import Topic
 from .user import User
 
 
+class RoomManager(BaseManager):
+
+    def with_related(self):
+        from .tag import Tag
+
+        return self.select_related("host", "topic").prefetch_related(
+            models.Prefetch("tag_set", queryset=Tag.objects.order_by("name")),
+            models.Prefetch("participants", queryset=User.objects.order_by("id"))
+        )
+
+    def get_summaries(self, limit, cursor=None):
+        from core.server.utils import WebSocketUtils
+
+        rooms = self.annotate(count_of_participants=models.Count("participants")).order_by("-id")
+
+        if cursor is not None:
+            rooms = rooms.filter(id__lt=cursor)
+
+        rooms = list(rooms.values("id", "title", "number_of_participants", "count_of_participants")[:limit + 1])
+
+        summaries = [
+            WebSocketUtils.get_room_summary(room, count_of_participants=room["count_of_participants"])
+            for room in rooms[:limit]
+        ]
+
+        return summaries, summaries[-1]["id"] if len(rooms) > limit else None
+
+
 class Room(BaseModel):
 
     class Language(models.TextChoices):
@@ -36,6 +64,8 @@ class Room(BaseModel):
     key = models.CharField(max_length=16, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = RoomManager()
+
     def clean(self):
         super(Room, self).clean()
 
@@ -0,0 +1,138 @@
+import numpy as np
+
+
+class BallTreeNeighbors:
+
+    def __init__(self, n_neighbors=3, n_components=64, random_state=0):
+        self.n_neighbors = n_neighbors
+        self.n_components = n_components
+        self.random_state = random_state
+
+    def _project(self, matrix):
+        return np.asarray(matrix @ self._projection)
+
+    def fit(self, matrix):
+        from sklearn.neighbors import NearestNeighbors
+
+        random = np.random.default_rng(self.random_state)
+
+        self._projection = random.standard_normal((matrix.shape[1], self.n_components)) / np.sqrt(self.n_components)
+        self._model = NearestNeighbors(n_neighbors=self.n_neighbors, algorithm="ball_tree")
+        self._model.fit(self._project(matrix))
+
+        return self
+
+    def kneighbors(self, matrix, n_neighbors=None):
+        return self._model.kneighbors(self._project(matrix), n_neighbors=n_neighbors or self.n_neighbors)
+
+
+class RandomProjectionNeighbors:
+
+    def __init__(self, n_neighbors=3, n_tables=16, n_bits=8, n_candidates=64, random_state=0):
+        self.n_neighbors = n_neighbors
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.n_candidates = n_candidates
+        self.random_state = random_state
+
+    def _hash(self, matrix):
+        bits = np.asarray(matrix @ self._planes) > 0
+        bits = bits.reshape(matrix.shape[0], self.n_tables, self.n_bits)
+
+        return bits.astype(np.int64) @ (1 << np.arange(self.n_bits, dtype=np.int64))
+
+    def _get_candidates(self, codes):
+        candidates = []
+
+        for table, code in enumerate(codes):
+            order, sorted_codes = self._tables[table]
+
+            start = np.searchsorted(sorted_codes, code, side="left")
+            end = min(np.searchsorted(sorted_codes, code, side="right"), start + self.n_candidates)
+
+            candidates.append(order[start:end])
+
+        return np.unique(np.concatenate(candidates))
+
+    def fit(self, matrix):
+        random = np.random.default_rng(self.random_state)
+
+        self._matrix = matrix.tocsr()
+        self._norms = np.asarray(self._matrix.multiply(self._matrix).sum(axis=1)).ravel()
+        self._planes = random.standard_normal((matrix.shape[1], self.n_tables * self.n_bits))
+
+        codes = self._hash(self._matrix)
+
+        self._tables = []
+
+        for table in range(self.n_tables):
+            order = np.argsort(codes[:, table], kind="stable")
+            self._tables.append((order, codes[order, table]))
+
+        return self
+
+    def kneighbors(self, matrix, n_neighbors=None):
+        n = n_neighbors or self.n_neighbors
+
+        matrix = matrix.tocsr()
+        norms = np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel()
+
+        distances = np.empty((matrix.shape[0], n))
+        indices = np.empty((matrix.shape[0], n), dtype=np.int64)
+
+        for row, codes in enumerate(self._hash(matrix)):
+            candidates = self._get_candidates(codes)
+
+            if len(candidates) < n:
+                candidates = np.arange(self._matrix.shape[0])
+
+            products = np.asarray((self._matrix[candidates] @ matrix[row].T).todense()).ravel()
+            squared = np.maximum(self._norms[candidates] + norms[row] - 2 * products, 0)
+
+            nearest = np.argpartition(squared, n - 1)[:n] if len(candidates) > n else np.arange(n)
+            nearest = nearest[np.argsort(squared[nearest], kind="stable")]
+
+            distances[row] = np.sqrt(squared[nearest])
+            indices[row] = candidates[nearest]
+
+        return distances, indices
+
+
+class BruteForceNeighbors:
+
+    def __init__(self, n_neighbors=3, **options):
+        self.n_neighbors = n_neighbors
+        self.options = options
+
+    def fit(self, matrix):
+        from sklearn.neighbors import NearestNeighbors
+        from sklearn.utils import check_array
+
+        self._matrix = check_array(matrix, accept_sparse="csr")
+
+        # NearestNeighbors copies sparse input, so it is fitted on the first row
+        # and then pointed at the matrix itself to keep memory-mapped arrays shared.
+        self._model = NearestNeighbors(n_neighbors=self.n_neighbors, algorithm="brute", **self.options)
+        self._model.fit(self._matrix[:1])
+        self._model._fit_X = self._matrix
+        self._model.n_samples_fit_ = self._matrix.shape[0]
+
+        return self
+
+    def kneighbors(self, matrix, n_neighbors=None):
+        return self._model.kneighbors(matrix, n_neighbors=n_neighbors or self.n_neighbors)
+
+
+BACKENDS = {
+    "brute": BruteForceNeighbors,
+    "cosine": lambda n_neighbors, **options: BruteForceNeighbors(n_neighbors, metric="cosine", **options),
+    "ball_tree": BallTreeNeighbors,
+    "lsh": RandomProjectionNeighbors,
+}
+
+
+def get_neighbors_model(backend, n_neighbors, **options):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown neighbors backend: {backend}.")
+
+    return BACKENDS[backend](n_neighbors=n_neighbors, **options)
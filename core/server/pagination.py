@@ -0,0 +1,104 @@
+import base64
+import binascii
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+
+    page_size = 50
+    max_page_size = 100
+    page_size_query_param = "page_size"
+    before_query_param = "before"
+    after_query_param = "after"
+    ordering = ("created_at", "id")
+
+    def _encode_cursor(self, instance):
+        field, tiebreaker = self.ordering
+        cursor = f"{getattr(instance, field).isoformat()}|{getattr(instance, tiebreaker)}"
+
+        return base64.urlsafe_b64encode(cursor.encode()).decode()
+
+    def _decode_cursor(self, value):
+        if value is None:
+            return None
+
+        try:
+            position, pk = base64.urlsafe_b64decode(value.encode()).decode().split("|")
+            position, pk = parse_datetime(position), int(pk)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound("Invalid cursor.")
+
+        if position is None:
+            raise NotFound("Invalid cursor.")
+
+        return position, pk
+
+    def _get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        return min(max(page_size, 1), self.max_page_size)
+
+    def _get_link(self, param, instance):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.before_query_param)
+        url = remove_query_param(url, self.after_query_param)
+
+        return replace_query_param(url, param, self._encode_cursor(instance))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+
+        page_size = self._get_page_size(request)
+        before = self._decode_cursor(request.query_params.get(self.before_query_param))
+        after = self._decode_cursor(request.query_params.get(self.after_query_param))
+
+        field, tiebreaker = self.ordering
+
+        if after is not None:
+            queryset = queryset.filter(
+                Q(**{f"{field}__gt": after[0]}) | Q(**{field: after[0], f"{tiebreaker}__gt": after[1]})
+            ).order_by(field, tiebreaker)
+
+            page = list(queryset[:page_size + 1])
+
+            self.has_previous, self.has_next = True, len(page) > page_size
+            self.page = page[:page_size]
+        else:
+            if before is not None:
+                queryset = queryset.filter(
+                    Q(**{f"{field}__lt": before[0]}) | Q(**{field: before[0], f"{tiebreaker}__lt": before[1]})
+                )
+
+            page = list(queryset.order_by(f"-{field}", f"-{tiebreaker}")[:page_size + 1])
+
+            self.has_previous, self.has_next = len(page) > page_size, before is not None
+            self.page = page[:page_size][::-1]
+
+        return self.page
+
+    def get_paginated_response(self, data):
+        has_page = len(self.page) != 0
+
+        return Response(OrderedDict([
+            ("previous", self._get_link(self.before_query_param, self.page[0])
+             if has_page and self.has_previous else None),
+            ("next", self._get_link(self.after_query_param, self.page[-1]) if has_page and self.has_next else None),
+            ("results", data)
+        ]))
+
+
+class NotificationPagination(PageNumberPagination):
+
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = "page_size"
@@ -1,32 +1,36 @@
-from collections import Counter, namedtuple
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import namedtuple
 
-import pandas as pd
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.neighbors import NearestNeighbors
-from sklearn.preprocessing import OneHotEncoder
+import numpy as np
+import scipy.sparse as sp
+from django.conf import settings
 
 from .models import Room
-from .serializers import RoomSerializer
+from .neighbors import get_neighbors_model
+from .utils import RecommendationUtils
 
 
 class RecommendationSystem:
 
-    def __init__(self, n, rooms):
+    def __init__(self, n, rooms, backend="brute", backend_options=None):
         self.n = n
-        self.rooms = rooms
+        self.version = 0
+        self.backend = backend
+        self.backend_options = backend_options or dict()
 
-        self._encoders = {
-            "topic": OneHotEncoder(dtype=float),
-            "language": OneHotEncoder(dtype=float),
-            "tags": CountVectorizer(binary=True, dtype=float)
-        }
         self._weights = {
             "topic": 5.0,
             "language": 1.0,
             "tags": 3.0
         }
-        self._model = NearestNeighbors(n_neighbors=n)
-        self._Point = namedtuple("Point", ["distance", "index"])
+        self._index = dict()
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._Snapshot = namedtuple("Snapshot", ["version", "ids", "vocabulary", "scaling", "matrix", "model"])
 
         self.train(rooms)
 
@@ -34,86 +38,333 @@ class RecommendationSystem:
         data = []
 
         for row in raw_data:
+            tags = row["tags"].split(",") if isinstance(row["tags"], str) else [tag["name"] for tag in row["tags"]]
+
             data.append({
                 "id": row["id"],
                 "topic": row["topic"] if isinstance(row["topic"], str) else row["topic"]["title"],
                 "language": row["language"],
-                "tags": row["tags"] if isinstance(row["tags"], str) else ",".join([tag["name"] for tag in row["tags"]])
+                "tags": tuple(sorted(set(tag for tag in tags if len(tag) > 0)))
             })
 
         return data
 
-    def _prepare_data(self, data):
-        df = pd.DataFrame.from_records(data)
+    def _get_features(self, row):
+        return [("topic", row["topic"]), ("language", row["language"]), *[("tags", tag) for tag in row["tags"]]]
 
-        encoder, weight = self._encoders["topic"], self._weights["topic"]
-        try:
-            topics = encoder.transform(df[["topic"]]).toarray() * weight
-        except ValueError:
-            topics = encoder.fit_transform(df[["topic"]]).toarray() * weight
+    def _prepare_data(self, data, vocabulary, fit=False):
+        indptr, indices = [0], []
 
-        encoder, weight = self._encoders["language"], self._weights["language"]
-        try:
-            languages = encoder.transform(df[["language"]]).toarray() * weight
-        except ValueError:
-            languages = encoder.fit_transform(df[["language"]]).toarray() * weight
+        for row in data:
+            for feature in self._get_features(row):
+                column = vocabulary.get(feature)
 
-        encoder, weight = self._encoders["tags"], self._weights["tags"]
-        try:
-            tags = encoder.transform(df["tags"]).toarray() * weight
-        except ValueError:
-            tags = encoder.fit_transform(df["tags"]).toarray() * weight
+                if column is None and fit:
+                    column = vocabulary[feature] = len(vocabulary)
 
-        df_encoded = pd.concat([
-            df.drop(["topic", "language", "tags"], axis=1),
-            pd.DataFrame(topics, columns=self._encoders["topic"].get_feature_names_out()),
-            pd.DataFrame(languages, columns=self._encoders["language"].get_feature_names_out()),
-            pd.DataFrame(tags, columns="tag_" + self._encoders["tags"].get_feature_names_out())
-        ], axis=1)
+                if column is not None:
+                    indices.append(column)
 
-        return df_encoded
+            indptr.append(len(indices))
 
-    def train(self, rooms):
-        if len(rooms) == 0:
+        return sp.csr_matrix(
+            (np.ones(len(indices)), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int32)),
+            shape=(len(data), len(vocabulary))
+        )
+
+    def _get_scaling(self, vocabulary):
+        return sp.diags(np.array([self._weights[feature] for feature, _ in vocabulary], dtype=float), format="csr")
+
+    def _build(self, version, ids, vocabulary, matrix):
+        model = get_neighbors_model(self.backend, n_neighbors=min(self.n, len(ids)), **self.backend_options)
+        model.fit(matrix)
+
+        return self._Snapshot(
+            version=version,
+            ids=ids,
+            vocabulary=vocabulary,
+            scaling=self._get_scaling(vocabulary),
+            matrix=matrix,
+            model=model
+        )
+
+    def _fit(self, version, data):
+        if len(data) == 0:
+            return None
+
+        vocabulary = dict()
+
+        matrix = self._prepare_data(data, vocabulary, fit=True)
+        matrix = matrix @ self._get_scaling(vocabulary)
+
+        ids = np.array([row["id"] for row in data])
+
+        return self._build(version, ids, vocabulary, matrix)
+
+    def _restore_index(self):
+        if self._index is not None:
+            return self._index
+
+        snapshot = self._snapshot
+        self._index = dict()
+
+        if snapshot is None:
+            return self._index
+
+        features = list(snapshot.vocabulary)
+        indices, indptr = snapshot.matrix.indices.tolist(), snapshot.matrix.indptr.tolist()
+
+        for row, room_id in enumerate(snapshot.ids.tolist()):
+            values = {"topic": None, "language": None, "tags": []}
+
+            for column in indices[indptr[row]:indptr[row + 1]]:
+                feature, value = features[column]
+
+                if feature == "tags":
+                    values["tags"].append(value)
+                else:
+                    values[feature] = value
+
+            self._index[room_id] = {"id": room_id, **values, "tags": tuple(sorted(values["tags"]))}
+
+        return self._index
+
+    def _commit(self):
+        self.version += 1
+        self._snapshot = self._fit(self.version, list(self._index.values()))
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    def save(self, directory, keep=2):
+        snapshot = self._snapshot
+
+        if snapshot is None:
             return None
 
-        self.rooms = rooms
+        os.makedirs(directory, exist_ok=True)
+
+        path = tempfile.mkdtemp(prefix=f"{snapshot.version:010d}-", dir=directory)
+        matrix = snapshot.matrix
+
+        for name, array in (("ids", snapshot.ids), ("data", matrix.data), ("indices", matrix.indices),
+                            ("indptr", matrix.indptr)):
+            np.save(os.path.join(path, f"{name}.npy"), array)
+
+        with open(os.path.join(path, "snapshot.json"), "w") as file:
+            json.dump({
+                "version": snapshot.version,
+                "shape": matrix.shape,
+                "vocabulary": list(snapshot.vocabulary)
+            }, file)
+
+        pointer = os.path.join(directory, "CURRENT")
+
+        with open(f"{pointer}.tmp", "w") as file:
+            file.write(os.path.basename(path))
+
+        os.replace(f"{pointer}.tmp", pointer)
+
+        snapshots = sorted(name for name in os.listdir(directory) if os.path.isdir(os.path.join(directory, name)))
+
+        for name in snapshots[:-keep]:
+            if name == os.path.basename(path):
+                continue
+
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+        return path
 
+    def load(self, directory):
+        pointer = os.path.join(directory, "CURRENT")
+
+        if not os.path.exists(pointer):
+            return False
+
+        with open(pointer) as file:
+            path = os.path.join(directory, file.read().strip())
+
+        with open(os.path.join(path, "snapshot.json")) as file:
+            meta = json.load(file)
+
+        arrays = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+            for name in ("ids", "data", "indices", "indptr")
+        }
+
+        vocabulary = {(feature, value): column for column, (feature, value) in enumerate(meta["vocabulary"])}
+        matrix = sp.csr_matrix((arrays["data"], arrays["indices"], arrays["indptr"]), shape=tuple(meta["shape"]))
+
+        with self._lock:
+            self.version = meta["version"]
+            self._index = None
+            self._snapshot = self._build(meta["version"], arrays["ids"], vocabulary, matrix)
+
+        return True
+
+    def train(self, rooms):
         data = self._collect_data(raw_data=rooms)
-        df = self._prepare_data(data)
 
-        self._df_rooms = df
+        with self._lock:
+            self._index = {row["id"]: row for row in data}
+            self._commit()
 
-        self._model.fit(df.drop(["id"], axis=1))
+    def update_rooms(self, rooms=(), removed=()):
+        data = self._collect_data(raw_data=rooms)
+
+        with self._lock:
+            index = self._restore_index()
+            changed = False
+
+            for row in data:
+                if index.get(row["id"]) != row:
+                    index[row["id"]] = row
+                    changed = True
+
+            for room_id in removed:
+                if index.pop(room_id, None) is not None:
+                    changed = True
+
+            if changed:
+                self._commit()
+
+        return changed
+
+    def update_room(self, room):
+        return self.update_rooms(rooms=[room])
+
+    def remove_room(self, room_id):
+        return self.update_rooms(removed=[room_id])
+
+    def get_batch_recommendations(self, histories):
+        snapshot = self._snapshot
+        recommendations = [dict() for _ in histories]
+
+        if snapshot is None:
+            return recommendations
+
+        vocabulary = snapshot.vocabulary
+
+        data, owners = [], []
+
+        for owner, history in enumerate(histories):
+            rows = [
+                row for row in self._collect_data(raw_data=history)
+                if ("topic", row["topic"]) in vocabulary and ("language", row["language"]) in vocabulary
+            ][:10]
+
+            data.extend(rows)
+            owners.extend([owner] * len(rows))
+
+        if len(data) == 0:
+            return recommendations
+
+        matrix = self._prepare_data(data, vocabulary) @ snapshot.scaling
+
+        n, size = snapshot.model.n_neighbors, len(snapshot.ids)
+
+        _, indices = snapshot.model.kneighbors(matrix, n_neighbors=n)
+
+        neighbors = indices.T.ravel()
+        voters = np.tile(np.array(owners, dtype=np.int64), n)
+
+        keys, first, votes = np.unique(voters * size + neighbors, return_index=True, return_counts=True)
+        voters, neighbors = keys // size, keys % size
+
+        order = np.lexsort((first, -votes, voters))
+        voters, neighbors = voters[order], neighbors[order]
+
+        ranks = np.arange(len(voters)) - np.searchsorted(voters, voters)
+        top = ranks < n
+
+        for owner, neighbor, rank in zip(voters[top].tolist(), neighbors[top], ranks[top].tolist()):
+            recommendations[owner][snapshot.ids[neighbor].item()] = n - rank
+
+        return recommendations
 
     def get_recommendations(self, history):
-        data = self._collect_data(raw_data=history)
-        df = self._prepare_data(data)
+        return self.get_batch_recommendations(histories=[history])[0]
 
-        distances, indices = self._model.kneighbors(df.drop(["id"], axis=1), n_neighbors=self.n)
-        points = [
-            self._Point(distance=row[0][index], index=row[1][index])
-            for index in range(self.n)
-            for row in zip(distances, indices)
-        ]
+    def _prepare_profiles(self, profiles, vocabulary):
+        indptr, indices, data = [0], [], []
 
-        most_common_neighbors = [point[0] for point in Counter(points).most_common(n=self.n)]
+        for profile in profiles:
+            for feature, weight in profile.items():
+                column = vocabulary.get(feature)
 
-        recommended = [self._df_rooms.iloc[neighbor.index]["id"] for neighbor in most_common_neighbors]
+                if column is not None:
+                    indices.append(column)
+                    data.append(weight)
 
-        recommendations = {
-            room["id"]: len(recommended) - recommended.index(room["id"]) if room["id"] in recommended else 0
-            for room in self.rooms
-        }
+            indptr.append(len(indices))
+
+        return sp.csr_matrix(
+            (np.array(data, dtype=float), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int32)),
+            shape=(len(profiles), len(vocabulary))
+        )
+
+    def get_batch_profile_recommendations(self, profiles):
+        snapshot = self._snapshot
+        recommendations = [dict() for _ in profiles]
+
+        if snapshot is None:
+            return recommendations
+
+        matrix = self._prepare_profiles(profiles, snapshot.vocabulary) @ snapshot.scaling
+        owners = np.flatnonzero(np.diff(matrix.indptr) > 0)
+
+        if len(owners) == 0:
+            return recommendations
+
+        n = snapshot.model.n_neighbors
+
+        _, indices = snapshot.model.kneighbors(matrix[owners], n_neighbors=n)
+
+        for owner, neighbors in zip(owners.tolist(), indices.tolist()):
+            recommendations[owner] = {
+                snapshot.ids[neighbor].item(): n - rank for rank, neighbor in enumerate(neighbors)
+            }
 
         return recommendations
 
+    def get_profile_recommendations(self, profile):
+        return self.get_batch_profile_recommendations(profiles=[profile])[0]
+
+
+def get_rooms_data():
+    return [
+        RecommendationUtils.get_room_data(room)
+        for room in Room.objects.select_related("topic").prefetch_related("tag_set")
+    ]
+
+
+_recommendation_system = None
+_recommendation_system_lock = threading.Lock()
+
+
+def get_recommendation_system(train=True):
+    global _recommendation_system
+
+    if _recommendation_system is not None:
+        return _recommendation_system
+
+    with _recommendation_system_lock:
+        if _recommendation_system is None:
+            config = settings.RECOMMENDATION_SYSTEM
+
+            recommendation_system = RecommendationSystem(
+                n=config["NUMBER_OF_RECOMMENDATIONS"],
+                rooms=[],
+                backend=config["BACKEND"],
+                backend_options=config["BACKEND_OPTIONS"]
+            )
+
+            loaded = config["SNAPSHOT_DIR"] is not None and recommendation_system.load(config["SNAPSHOT_DIR"])
+
+            if not loaded and train:
+                recommendation_system.train(rooms=get_rooms_data())
+
+            _recommendation_system = recommendation_system
 
-recommendation_system = RecommendationSystem(
-    n=3,
-    rooms=RoomSerializer(
-        instance=Room.objects.all(),
-        context={"related": True},
-        many=True
-    ).data
-)
+    return _recommendation_system
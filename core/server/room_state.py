@@ -0,0 +1,174 @@
+import json
+import time
+
+from django.conf import settings
+
+
+class InMemoryRoomStateStore:
+
+    def __init__(self, ttl=86400):
+        self.ttl = ttl
+
+        self._kicked_users = dict()
+        self._voice_chat_users = dict()
+        self._expires_at = dict()
+
+    def _expire(self):
+        now = time.monotonic()
+
+        for group in [group for group, expires_at in self._expires_at.items() if expires_at <= now]:
+            self._kicked_users.pop(group, None)
+            self._voice_chat_users.pop(group, None)
+            self._expires_at.pop(group)
+
+    def _touch(self, group):
+        self._expire()
+
+        if len(self._kicked_users.get(group, ())) == 0 and len(self._voice_chat_users.get(group, ())) == 0:
+            self._kicked_users.pop(group, None)
+            self._voice_chat_users.pop(group, None)
+            self._expires_at.pop(group, None)
+        else:
+            self._expires_at[group] = time.monotonic() + self.ttl
+
+    async def kick_user(self, group, user_id):
+        self._kicked_users.setdefault(group, set()).add(user_id)
+        self._touch(group)
+
+    async def is_kicked(self, group, user_id):
+        self._expire()
+
+        return user_id in self._kicked_users.get(group, ())
+
+    async def clear_kicked_users(self, group):
+        self._kicked_users.pop(group, None)
+        self._touch(group)
+
+    async def get_voice_chat_users(self, group):
+        self._expire()
+
+        return [dict(user) for user in self._voice_chat_users.get(group, dict()).values()]
+
+    async def add_voice_chat_user(self, group, user):
+        self._voice_chat_users.setdefault(group, dict()).setdefault(user["id"], dict(user))
+        self._touch(group)
+
+    async def update_voice_chat_user(self, group, user_id, **fields):
+        user = self._voice_chat_users.get(group, dict()).get(user_id)
+
+        if user is not None:
+            user.update(fields)
+            self._touch(group)
+
+    async def remove_voice_chat_user(self, group, user_id):
+        self._voice_chat_users.get(group, dict()).pop(user_id, None)
+        self._touch(group)
+
+
+class RedisRoomStateStore:
+
+    def __init__(self, url, ttl=86400, prefix="room-state"):
+        self.url = url
+        self.ttl = ttl
+        self.prefix = prefix
+
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from redis.asyncio import Redis
+
+            self._client = Redis.from_url(self.url)
+
+        return self._client
+
+    def _get_keys(self, group):
+        return f"{self.prefix}:{group}:kicked", f"{self.prefix}:{group}:voice"
+
+    async def _execute(self, group, *commands):
+        async with self.client.pipeline(transaction=True) as pipeline:
+            for command, key, *args in commands:
+                getattr(pipeline, command)(key, *args)
+
+            for key in self._get_keys(group):
+                pipeline.expire(key, self.ttl)
+
+            results = await pipeline.execute()
+
+        return results[:len(commands)]
+
+    async def kick_user(self, group, user_id):
+        kicked, _ = self._get_keys(group)
+        await self._execute(group, ("sadd", kicked, user_id))
+
+    async def is_kicked(self, group, user_id):
+        kicked, _ = self._get_keys(group)
+        return bool(await self.client.sismember(kicked, user_id))
+
+    async def clear_kicked_users(self, group):
+        kicked, _ = self._get_keys(group)
+        await self.client.delete(kicked)
+
+    async def get_voice_chat_users(self, group):
+        _, voice = self._get_keys(group)
+        return [json.loads(user) for user in (await self.client.hgetall(voice)).values()]
+
+    async def add_voice_chat_user(self, group, user):
+        _, voice = self._get_keys(group)
+        await self._execute(group, ("hsetnx", voice, user["id"], json.dumps(user)))
+
+    async def update_voice_chat_user(self, group, user_id, **fields):
+        from redis.exceptions import WatchError
+
+        _, voice = self._get_keys(group)
+
+        async with self.client.pipeline(transaction=True) as pipeline:
+            while True:
+                try:
+                    await pipeline.watch(voice)
+
+                    user = await pipeline.hget(voice, user_id)
+
+                    if user is None:
+                        return None
+
+                    pipeline.multi()
+                    pipeline.hset(voice, user_id, json.dumps({**json.loads(user), **fields}))
+                    pipeline.expire(voice, self.ttl)
+
+                    await pipeline.execute()
+
+                    return None
+                except WatchError:
+                    continue
+
+    async def remove_voice_chat_user(self, group, user_id):
+        _, voice = self._get_keys(group)
+        await self.client.hdel(voice, user_id)
+
+
+BACKENDS = {
+    "memory": InMemoryRoomStateStore,
+    "redis": RedisRoomStateStore,
+}
+
+
+def create_room_state_store(backend, **options):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown room state backend: {backend}.")
+
+    return BACKENDS[backend](**options)
+
+
+_room_state_store = None
+
+
+def get_room_state_store():
+    global _room_state_store
+
+    if _room_state_store is None:
+        config = settings.ROOM_STATE
+        _room_state_store = create_room_state_store(config["BACKEND"], ttl=config["TTL"], **config["OPTIONS"])
+
+    return _room_state_store
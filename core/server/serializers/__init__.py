@@ -2,7 +2,7 @@ from .auth import (AuthorizationSerializer, DeauthorizationSerializer, PasswordR
                    PasswordResetSerializer, RegistrationSerializer)
 from .history import HistorySerializer
 from .message import MessageSerializer
-from .notification import NotificationSerializer
+from .notification import NotificationSerializer, ViewingSerializer
 from .report import ReportSerializer
 from .room import ConnectingSerializer, DisconnectingSerializer, RoomSerializer
 from .tag import TagSerializer
@@ -6,7 +6,6 @@ from rest_framework.serializers import ModelSerializer
 
 from core.server.models import Message, Room
 
-from .room import RoomSerializer
 from .user import UserSerializer
 
 
@@ -14,6 +13,8 @@ class MessageSerializer(ModelSerializer):
 
     short_message = serializers.CharField(read_only=True)
 
+    max_reply_depth = 1
+
     class Meta:
         model = Message
         exclude = ["author", "room"]
@@ -41,10 +42,15 @@ class MessageSerializer(ModelSerializer):
         self.context["related"] = True
 
         data["message"]["author"] = UserSerializer(instance=instance.author, context=self.context).data
-        data["message"]["room"] = RoomSerializer(instance=instance.room, context=self.context).data
+        data["message"]["room"] = instance.room_id
+
+        reply_depth = self.context.get("reply_depth", 0)
 
-        if instance.reply_to is not None:
-            data["message"]["reply_to"] = MessageSerializer(instance=instance.reply_to, context=self.context).data
+        if instance.reply_to_id is not None and reply_depth < self.max_reply_depth:
+            data["message"]["reply_to"] = MessageSerializer(
+                instance=instance.reply_to,
+                context={**self.context, "reply_depth": reply_depth + 1}
+            ).data
 
         if related or self.context["request"].method == "GET":
             return data["message"]
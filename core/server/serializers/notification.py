@@ -1,9 +1,11 @@
 import json
 from collections import OrderedDict
 
-from rest_framework.serializers import ModelSerializer
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import ModelSerializer, Serializer
 
-from core.server.models import Message, Notification, Report, Room, User
+from core.server.models import Notification, Report
 
 from .message import MessageSerializer
 from .report import ReportSerializer
@@ -15,7 +17,24 @@ class NotificationSerializer(ModelSerializer):
 
     class Meta:
         model = Notification
-        fields = "__all__"
+        exclude = ["room", "user", "message", "report"]
+
+    def _prepare_report(self, report):
+        report["reason"] = Report.Reason.choices[report["reason"]][1]
+        return report
+
+    def _render(self, serializer_class, instance, prepare=None):
+        if instance is None:
+            return None
+
+        rendered_content = self.context.setdefault("rendered_content", dict())
+        key = (instance._meta.label, instance.pk, getattr(instance, "updated_at", None))
+
+        if key not in rendered_content:
+            data = serializer_class(instance=instance, context=self.context).data
+            rendered_content[key] = data if prepare is None else prepare(data)
+
+        return rendered_content[key]
 
     def to_representation(self, instance):
         related = self.context.get("related")
@@ -30,26 +49,14 @@ class NotificationSerializer(ModelSerializer):
         content = json.loads(data["notification"]["content"])
 
         if notification_type == Notification.NotificationType.MENTION:
-            room = Room.objects.get(pk=content["room"])
-            user = User.objects.get(pk=content["user"])
-
-            content["room"] = RoomSerializer(instance=room, context=self.context).data
-            content["user"] = UserSerializer(instance=user, context=self.context).data
+            content["room"] = self._render(RoomSerializer, instance.room)
+            content["user"] = self._render(UserSerializer, instance.user)
         elif notification_type in (Notification.NotificationType.REPORT, Notification.NotificationType.WARNING):
-            report = Report.objects.get(pk=content["report"])
-
-            report = ReportSerializer(instance=report, context=self.context).data
-            report["reason"] = Report.Reason.choices[report["reason"]][1]
-
-            content["report"] = report
+            content["report"] = self._render(ReportSerializer, instance.report, prepare=self._prepare_report)
         elif notification_type == Notification.NotificationType.MESSAGE_REPLY:
-            room = Room.objects.get(pk=content["room"])
-            user = User.objects.get(pk=content["user"])
-            message = Message.objects.get(pk=content["message"])
-
-            content["room"] = RoomSerializer(instance=room, context=self.context).data
-            content["user"] = UserSerializer(instance=user, context=self.context).data
-            content["message"] = MessageSerializer(instance=message, context=self.context).data
+            content["room"] = self._render(RoomSerializer, instance.room)
+            content["user"] = self._render(UserSerializer, instance.user)
+            content["message"] = self._render(MessageSerializer, instance.message)
 
         data["notification"]["content"] = content
 
@@ -59,3 +66,16 @@ class NotificationSerializer(ModelSerializer):
         data["details"] = "Notification has been updated."
 
         return data
+
+
+class ViewingSerializer(Serializer):
+
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False)
+    before = serializers.DateTimeField(required=False)
+    all = serializers.BooleanField(required=False)
+
+    def validate(self, attrs):
+        if not attrs.get("all") and attrs.get("ids") is None and attrs.get("before") is None:
+            raise ValidationError({"ids": "Either ids, before or all must be provided."})
+
+        return super(ViewingSerializer, self).validate(attrs)
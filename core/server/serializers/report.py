@@ -35,7 +35,7 @@ class ReportSerializer(ModelSerializer):
         data["report"]["accused"] = UserSerializer(instance=instance.accused, context=self.context).data
 
         if self.context["request"].method == "GET" and self.context["request"].user.is_staff:
-            accused_rooms = Room.objects.filter(host=instance.accused)
+            accused_rooms = Room.objects.with_related().filter(host=instance.accused)
             data["report"]["accused"]["rooms"] = [
                 {
                     "id": room["id"],
@@ -1,11 +1,13 @@
 import hashlib
 from collections import OrderedDict
 
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.exceptions import NotFound, PermissionDenied
 from rest_framework.serializers import ModelSerializer, Serializer
 
-from core.server.models import History, Room, Tag, User
+from core.server.models import History, Preference, Room, Tag, User
 
 from .tag import TagSerializer
 from .topic import TopicSerializer
@@ -42,12 +44,12 @@ class RoomSerializer(ModelSerializer):
         data["room"]["host"] = UserSerializer(instance=instance.host, context=self.context).data
         data["room"]["topic"] = TopicSerializer(instance=instance.topic, context=self.context).data
         data["room"]["tags"] = TagSerializer(
-            instance=Tag.objects.filter(room=instance.id),
+            instance=instance.tag_set.all(),
             context=self.context,
             many=True
         ).data
         data["room"]["participants"] = UserSerializer(
-            instance=sorted(instance.participants.all(), key=lambda user: user.id != instance.host.id),
+            instance=sorted(instance.participants.all(), key=lambda user: user.id != instance.host_id),
             context=self.context,
             many=True
         ).data
@@ -55,7 +57,7 @@ class RoomSerializer(ModelSerializer):
         if self.context.get("request") is not None:
             user = self.context["request"].user
 
-            if len(instance.key) > 0 and instance.host != user:
+            if len(instance.key) > 0 and instance.host_id != user.id:
                 data["room"]["key"] = hashlib.sha256(instance.key.encode()).hexdigest()
 
         if related or self.context["request"].method == "GET":
@@ -82,15 +84,15 @@ class ConnectingSerializer(Serializer):
         if user is None:
             raise NotFound("No user was found.")
 
-        if Room.objects.filter(participants__in=[user]).count() != 0:
+        if Room.objects.filter(participants=user).exists():
             raise PermissionDenied("User is already in the room.")
 
-        if self.instance.participants.count() == self.instance.number_of_participants:
+        if self.instance.participants.count() >= self.instance.number_of_participants:
             raise PermissionDenied("Room is full.")
 
         attrs["user"] = user
 
-        if self.instance.host == user:
+        if self.instance.host_id == user.id:
             return super(ConnectingSerializer, self).validate(attrs)
 
         key = attrs.get("key")
@@ -106,19 +108,27 @@ class ConnectingSerializer(Serializer):
     def update(self, instance, validated_data):
         user = validated_data["user"]
 
-        instance.participants.add(user)
-        instance.save()
-
         topic = instance.topic.title
-        tags = ",".join([tag.name for tag in Tag.objects.filter(room=instance)])
+        tags = ",".join(Tag.objects.filter(room=instance).values_list("name", flat=True))
         language = instance.language
 
-        History.objects.create(
-            owner=user,
-            topic=topic,
-            tags=tags,
-            language=language
-        )
+        with transaction.atomic():
+            instance.participants.add(user)
+
+            preference, created = Preference.objects.select_for_update().get_or_create(owner=user)
+
+            if created:
+                Preference.objects.seed_from_histories(preferences=[preference])
+
+            preference.add(topic=topic, language=language, tags=tags, recorded_at=timezone.now())
+            preference.save()
+
+            History.objects.create(
+                owner=user,
+                topic=topic,
+                tags=tags,
+                language=language
+            )
 
         return instance
 
@@ -133,7 +143,7 @@ class DisconnectingSerializer(Serializer):
         if user is None:
             raise NotFound("No user was found.")
 
-        if user not in self.instance.participants.all():
+        if not self.instance.participants.filter(pk=user.pk).exists():
             raise PermissionDenied("User is not in room.")
 
         attrs["user"] = user
@@ -144,6 +154,5 @@ class DisconnectingSerializer(Serializer):
         user = validated_data["user"]
 
         instance.participants.remove(user)
-        instance.save()
 
         return instance
@@ -0,0 +1,55 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import History, Room, Tag, Topic
+from .utils import RecommendationUtils, WebSocketUtils
+
+
+@receiver(post_save, sender=Room)
+def update_recommendations_on_room_save(sender, instance, **kwargs):
+    RecommendationUtils.update_rooms(rooms=[RecommendationUtils.get_room_data(instance)])
+
+
+@receiver(post_delete, sender=Room)
+def update_recommendations_on_room_delete(sender, instance, **kwargs):
+    RecommendationUtils.update_rooms(removed=[instance.id])
+
+
+@receiver((post_save, post_delete), sender=Tag)
+def update_recommendations_on_tag_change(sender, instance, **kwargs):
+    room = Room.objects.get_or_none(pk=instance.room_id)
+
+    if room is None:
+        return None
+
+    RecommendationUtils.update_rooms(rooms=[RecommendationUtils.get_room_data(room)])
+
+
+@receiver((post_save, post_delete), sender=Tag)
+def update_room_list_on_tag_change(sender, instance, **kwargs):
+    if not Room.objects.filter(pk=instance.room_id).exists():
+        return None
+
+    WebSocketUtils.update_room_list(updated=[{
+        "id": instance.room_id,
+        "tags": list(Tag.objects.filter(room=instance.room_id).values("id", "name", "room"))
+    }])
+
+
+@receiver(post_save, sender=Topic)
+def update_recommendations_on_topic_save(sender, instance, created, **kwargs):
+    if created:
+        return None
+
+    RecommendationUtils.update_rooms(rooms=[
+        RecommendationUtils.get_room_data(room)
+        for room in Room.objects.filter(topic=instance).select_related("topic").prefetch_related("tag_set")
+    ])
+
+
+@receiver(post_save, sender=History)
+def update_recommendations_on_history_save(sender, instance, created, **kwargs):
+    if not created:
+        return None
+
+    RecommendationUtils.update_users(user_ids=[instance.owner_id])
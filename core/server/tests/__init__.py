@@ -65,8 +65,12 @@ REPORTS = {
 }
 NOTIFICATIONS = {
     "message reply": {
-        "notification_type": 3,
-        "content": "{\"room\": 1, \"user\": 1, \"message\": 1}"
+        "notification_type": 3
+    }
+}
+RECOMMENDATIONS = {
+    "best": {
+        "rating": 3
     }
 }
 HISTORIES = {
@@ -84,6 +88,7 @@ PATHS = {
     "profile": "/api/profile/",
     "notifications": "/api/notifications/",
     "notification": "/api/notification/",
+    "unread-notifications": "/api/unread-notifications/",
     "user": "/api/user/",
     "reports": "/api/reports/",
     "report": "/api/report/",
@@ -1,9 +1,13 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from django.test import TestCase
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
 
-from core.server.models import Notification, User
-from core.server.tests import NOTIFICATIONS, USERS
+from core.server.models import Message, Notification, Room, Topic, User
+from core.server.tests import MESSAGES, NOTIFICATIONS, ROOMS, TOPICS, USERS
 
 
 class NotificationTest(TestCase):
@@ -11,8 +15,17 @@ class NotificationTest(TestCase):
     @classmethod
     def setUpTestData(cls):
         recipient = User.objects.create_user(**USERS["user"])
+        topic = Topic.objects.create(**TOPICS["chatting"])
+        room = Room.objects.create(host=recipient, topic=topic, **ROOMS["just speak"])
+        message = Message.objects.create(room=room, author=recipient, **MESSAGES["greetings"])
 
-        Notification.objects.create(recipient=recipient, **NOTIFICATIONS["message reply"])
+        Notification.objects.create(
+            recipient=recipient,
+            room=room,
+            user=recipient,
+            message=message,
+            **NOTIFICATIONS["message reply"]
+        )
 
     def test_notification_fields(self):
         notification = Notification.objects.get(pk=1)
@@ -24,9 +37,14 @@ class NotificationTest(TestCase):
         self.assertEqual(notification.notification_type, NOTIFICATIONS["message reply"]["notification_type"])
 
         self.assertIsInstance(notification.content, str)
-        self.assertEqual(notification.content, NOTIFICATIONS["message reply"]["content"])
+        self.assertEqual(notification.content, "{}")
         self.assertEqual(notification._meta.get_field("content").max_length, 128)
 
+        self.assertIsInstance(notification.room, Room)
+        self.assertIsInstance(notification.user, User)
+        self.assertIsInstance(notification.message, Message)
+        self.assertIsNone(notification.report)
+
         self.assertIsInstance(notification.created_at, datetime)
 
         self.assertIsInstance(notification.is_viewed, bool)
@@ -38,3 +56,62 @@ class NotificationTest(TestCase):
         after_deleting = Notification.objects.count()
 
         self.assertGreater(before_deleting, after_deleting)
+
+    def test_notification_removing_on_deleting_message(self):
+        before_deleting = Notification.objects.count()
+        Message.objects.get(pk=1).delete()
+        after_deleting = Notification.objects.count()
+
+        self.assertGreater(before_deleting, after_deleting)
+
+    def test_notification_requires_targets(self):
+        recipient = User.objects.get(pk=1)
+        room = Room.objects.get(pk=1)
+
+        for fields in (
+            {"notification_type": 0, "room": room},
+            {"notification_type": 1},
+            {"notification_type": 2},
+            {"notification_type": 3, "room": room, "user": recipient}
+        ):
+            notification = Notification(recipient=recipient, **fields)
+
+            with self.assertRaises(ValidationError):
+                notification.full_clean()
+
+            with self.assertRaises(IntegrityError), transaction.atomic():
+                notification.save()
+
+        Notification.objects.create(recipient=recipient, notification_type=4)
+
+        self.assertEqual(Notification.objects.with_targets().count(), 2)
+        self.assertEqual(Notification.objects.without_targets().count(), 0)
+
+    def test_notification_retention(self):
+        from core.server.workers import RetentionWorker
+
+        recipient = User.objects.get(pk=1)
+        room = Room.objects.get(pk=1)
+
+        Notification.objects.bulk_create([
+            Notification(recipient=recipient, room=room, user=recipient, notification_type=notification_type)
+            for notification_type in (0, 0, 0, 4)
+        ])
+        Notification.objects.exclude(pk=1).update(created_at=timezone.now() - timedelta(days=10))
+
+        retention = {
+            **settings.NOTIFICATION_RETENTION,
+            "TYPES": {"STATUS_CHANGE": timedelta(days=30)}
+        }
+
+        with override_settings(NOTIFICATION_RETENTION=retention):
+            metrics = RetentionWorker(batch_size=2).purge()
+
+        self.assertEqual(metrics["purged"], 3)
+        self.assertEqual(metrics["batches"], 2)
+        self.assertEqual(metrics["types"]["Mention"], 3)
+
+        self.assertEqual(
+            list(Notification.objects.order_by("id").values_list("notification_type", flat=True)),
+            [3, 4]
+        )
@@ -0,0 +1,111 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.utils import IntegrityError
+from django.test import TestCase
+from django.utils import timezone
+
+from core.server.models import History, Preference, Room, Topic, User
+from core.server.serializers import ConnectingSerializer
+from core.server.tests import HISTORIES, ROOMS, TOPICS, USERS
+
+
+class PreferenceTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create_user(**USERS["user"])
+
+        Preference.objects.create(owner=owner)
+
+    def test_preference_fields(self):
+        preference = Preference.objects.get(pk=1)
+
+        self.assertIsInstance(preference.owner, User)
+        self.assertEqual(preference.owner.username, USERS["user"]["username"])
+
+        self.assertEqual(preference.features, dict())
+        self.assertEqual(preference.weight, 0)
+        self.assertIsNone(preference.updated_at)
+        self.assertEqual(preference.get_profile(), dict())
+
+    def test_preference_creation_with_non_unique_owner(self):
+        preference = Preference.objects.get(pk=1)
+
+        with self.assertRaises(IntegrityError):
+            Preference.objects.create(owner=preference.owner)
+
+    def test_preference_adding(self):
+        preference = Preference.objects.get(pk=1)
+        recorded_at = timezone.now()
+
+        preference.add(recorded_at=recorded_at, **HISTORIES["1970-01-01T00:00:00.0Z"])
+        preference.save()
+
+        preference = Preference.objects.get(pk=1)
+
+        self.assertEqual(preference.weight, 1)
+        self.assertEqual(preference.updated_at, recorded_at)
+        self.assertEqual(preference.get_profile(), {
+            ("topic", "chatting"): 1,
+            ("language", "english"): 1,
+            ("tags", "english"): 1
+        })
+
+    def test_preference_decaying(self):
+        preference = Preference.objects.get(pk=1)
+        recorded_at = timezone.now()
+        half_life = settings.RECOMMENDATION_SYSTEM["HALF_LIFE"]
+
+        preference.add(topic="chatting", tags="", language="english", recorded_at=recorded_at)
+        preference.add(topic="gaming", tags="", language="english", recorded_at=recorded_at + half_life)
+
+        self.assertAlmostEqual(preference.weight, 1.5)
+        self.assertAlmostEqual(preference.features["topic:chatting"], 0.5)
+        self.assertAlmostEqual(preference.features["topic:gaming"], 1)
+        self.assertAlmostEqual(preference.get_profile()[("language", "english")], 1)
+
+    def test_preference_pruning(self):
+        preference = Preference.objects.get(pk=1)
+        recorded_at = timezone.now()
+
+        preference.add(topic="chatting", tags="", language="english", recorded_at=recorded_at)
+        preference.add(topic="gaming", tags="", language="english", recorded_at=recorded_at + timedelta(days=365))
+
+        self.assertNotIn("topic:chatting", preference.features)
+
+    def test_preference_seeding_from_histories(self):
+        owner = User.objects.create_user(**USERS["test"])
+
+        for _ in range(2):
+            History.objects.create(owner=owner, **HISTORIES["1970-01-01T00:00:00.0Z"])
+
+        preferences = Preference.objects.seed_from_histories(preferences=[Preference(owner=owner)])
+
+        self.assertAlmostEqual(preferences[owner.id].weight, 2, places=3)
+        self.assertAlmostEqual(preferences[owner.id].get_profile()[("topic", "chatting")], 1)
+
+    def test_preference_creation_on_connecting_with_histories(self):
+        owner = User.objects.create_user(**USERS["test"])
+        topic = Topic.objects.create(**TOPICS["games"])
+        room = Room.objects.create(host=User.objects.get(pk=1), topic=topic, **ROOMS["just speak"])
+
+        for _ in range(3):
+            History.objects.create(owner=owner, **HISTORIES["1970-01-01T00:00:00.0Z"])
+
+        serializer = ConnectingSerializer(instance=room, data={"user": owner.id})
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        preference = Preference.objects.get(owner=owner)
+
+        self.assertAlmostEqual(preference.weight, 4, places=3)
+        self.assertAlmostEqual(preference.get_profile()[("topic", "chatting")], 0.75, places=3)
+        self.assertAlmostEqual(preference.get_profile()[("topic", "gaming")], 0.25, places=3)
+
+    def test_preference_removing_on_deleting_owner(self):
+        before_deleting = Preference.objects.count()
+        User.objects.get(pk=1).delete()
+        after_deleting = Preference.objects.count()
+
+        self.assertGreater(before_deleting, after_deleting)
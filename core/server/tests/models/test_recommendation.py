@@ -0,0 +1,221 @@
+import asyncio
+import os
+import tempfile
+from unittest import mock
+
+import numpy as np
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db.utils import IntegrityError
+from django.test import TestCase, override_settings
+
+from core.server.models import Recommendation, Room, Topic, User
+from core.server.neighbors import get_neighbors_model
+from core.server.recommendation_system import RecommendationSystem, get_rooms_data
+from core.server.tests import RECOMMENDATIONS, ROOMS, TOPICS, USERS
+
+
+class RecommendationTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create_user(**USERS["user"])
+        topic = Topic.objects.create(**TOPICS["chatting"])
+        room = Room.objects.create(host=owner, topic=topic, **ROOMS["just speak"])
+
+        Recommendation.objects.create(owner=owner, room=room, **RECOMMENDATIONS["best"])
+
+    def test_recommendation_fields(self):
+        recommendation = Recommendation.objects.get(pk=1)
+
+        self.assertIsInstance(recommendation.owner, User)
+        self.assertEqual(recommendation.owner.username, USERS["user"]["username"])
+
+        self.assertIsInstance(recommendation.room, Room)
+        self.assertEqual(recommendation.room.title, ROOMS["just speak"]["title"])
+
+        self.assertIsInstance(recommendation.rating, int)
+        self.assertEqual(recommendation.rating, RECOMMENDATIONS["best"]["rating"])
+
+    def test_recommendation_creation_with_non_unique_room_for_the_same_owner(self):
+        recommendation = Recommendation.objects.get(pk=1)
+
+        with self.assertRaises(IntegrityError):
+            Recommendation.objects.create(owner=recommendation.owner, room=recommendation.room, rating=1)
+
+    def test_recommendation_removing_on_deleting_room(self):
+        before_deleting = Recommendation.objects.count()
+        Room.objects.get(pk=1).delete()
+        after_deleting = Recommendation.objects.count()
+
+        self.assertGreater(before_deleting, after_deleting)
+
+
+class RecommendationSystemTest(TestCase):
+
+    def _get_rooms(self, count):
+        return [
+            {
+                "id": i,
+                "topic": f"topic#{i % 3}",
+                "language": "EN" if i % 2 else "UN",
+                "tags": f"tag#{i % 4},tag#{i % 5}"
+            }
+            for i in range(1, count + 1)
+        ]
+
+    def test_update_rooms_commits_once(self):
+        rooms = self._get_rooms(10)
+        recommendation_system = RecommendationSystem(n=3, rooms=rooms[:5])
+        version = recommendation_system.version
+
+        changed = recommendation_system.update_rooms(
+            rooms=[*rooms[5:], {**rooms[0], "language": "EN"}],
+            removed=[2, 3, 42]
+        )
+
+        self.assertTrue(changed)
+        self.assertEqual(recommendation_system.version, version + 1)
+        self.assertEqual(sorted(recommendation_system.snapshot.ids.tolist()), [1, 4, 5, 6, 7, 8, 9, 10])
+
+        self.assertFalse(recommendation_system.update_rooms(rooms=rooms[5:], removed=[2]))
+        self.assertEqual(recommendation_system.version, version + 1)
+
+    def test_batch_recommendations(self):
+        rooms = self._get_rooms(20)
+        recommendation_system = RecommendationSystem(n=3, rooms=rooms)
+
+        histories = [[rooms[4]] * 3, [rooms[0], rooms[6], rooms[12]], [], [{**rooms[1], "topic": "unknown"}]]
+        recommendations = recommendation_system.get_batch_recommendations(histories)
+
+        self.assertEqual(recommendations, [
+            recommendation_system.get_recommendations(history) for history in histories
+        ])
+        self.assertEqual(max(recommendations[0], key=recommendations[0].get), rooms[4]["id"])
+        self.assertEqual(sorted(recommendations[0].values(), reverse=True), [3, 2, 1])
+        self.assertEqual(len(recommendations[1]), 3)
+        self.assertEqual(recommendations[2:], [dict(), dict()])
+
+    def test_lsh_backend(self):
+        rooms = self._get_rooms(60)
+        brute = RecommendationSystem(n=3, rooms=rooms)
+        matrix = brute.snapshot.matrix
+
+        expected, _ = brute.snapshot.model.kneighbors(matrix, n_neighbors=3)
+
+        lsh = RecommendationSystem(n=3, rooms=rooms, backend="lsh")
+        distances, _ = lsh.snapshot.model.kneighbors(matrix, n_neighbors=3)
+
+        self.assertTrue(np.all(distances[:, 0] == 0))
+        self.assertTrue(np.all(distances >= expected - 1e-9))
+
+        lsh = RecommendationSystem(n=3, rooms=rooms, backend="lsh", backend_options={"n_bits": 2, "n_candidates": 60})
+        distances, _ = lsh.snapshot.model.kneighbors(matrix, n_neighbors=3)
+
+        self.assertTrue(np.allclose(distances, expected))
+        self.assertEqual(max(lsh.get_recommendations([rooms[4]]).items(), key=lambda item: item[1]), (5, 3))
+
+        with self.assertRaises(ValueError):
+            get_neighbors_model("unknown", n_neighbors=3)
+
+    def test_snapshot_saving_and_loading(self):
+        rooms = self._get_rooms(20)
+        recommendation_system = RecommendationSystem(n=3, rooms=rooms)
+
+        with tempfile.TemporaryDirectory() as directory:
+            loaded = RecommendationSystem(n=3, rooms=[])
+
+            self.assertFalse(loaded.load(directory))
+
+            for room in rooms[:3]:
+                recommendation_system.update_room({**room, "language": "FR"})
+                recommendation_system.save(directory, keep=2)
+
+            self.assertEqual(len([name for name in os.listdir(directory) if name != "CURRENT"]), 2)
+            self.assertTrue(loaded.load(directory))
+
+            snapshot = loaded.snapshot
+
+            self.assertEqual(loaded.version, recommendation_system.version)
+            self.assertFalse(snapshot.matrix.data.flags.writeable)
+            self.assertEqual((snapshot.matrix != recommendation_system.snapshot.matrix).nnz, 0)
+
+            for history in ([rooms[0]], [rooms[5], rooms[7]]):
+                self.assertEqual(
+                    loaded.get_recommendations(history),
+                    recommendation_system.get_recommendations(history)
+                )
+
+            self.assertTrue(loaded.update_rooms(rooms=[{**rooms[3], "tags": "tag#9"}], removed=[rooms[4]["id"]]))
+
+        self.assertEqual(loaded.version, recommendation_system.version + 1)
+        self.assertEqual(sorted(loaded.snapshot.ids.tolist()), [room["id"] for room in rooms if room["id"] != 5])
+        self.assertEqual(loaded._index[1], {**loaded._collect_data([rooms[0]])[0], "language": "FR"})
+
+    def test_loaded_model_shares_snapshot_arrays(self):
+        rooms = self._get_rooms(20)
+
+        for backend in ("brute", "cosine", "lsh"):
+            recommendation_system = RecommendationSystem(n=3, rooms=rooms, backend=backend)
+
+            with tempfile.TemporaryDirectory() as directory:
+                recommendation_system.save(directory)
+
+                loaded = RecommendationSystem(n=3, rooms=[], backend=backend)
+                loaded.load(directory)
+
+                snapshot = loaded.snapshot
+
+                for name in ("data", "indices", "indptr"):
+                    self.assertTrue(np.shares_memory(
+                        getattr(snapshot.model._matrix, name),
+                        getattr(snapshot.matrix, name)
+                    ))
+
+                self.assertEqual(
+                    loaded.get_recommendations([rooms[0]]),
+                    recommendation_system.get_recommendations([rooms[0]])
+                )
+
+
+class RecommendationWorkerTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        host = User.objects.create_user(**USERS["user"])
+        topic = Topic.objects.create(**TOPICS["chatting"])
+
+        for i in range(5):
+            Room.objects.create(host=host, topic=topic, title=f"room#{i}")
+
+    def _start(self, directory):
+        from core.server.workers import RecommendationWorker
+
+        worker = RecommendationWorker(interval=60, workers=0)
+
+        with override_settings(RECOMMENDATION_SYSTEM={**settings.RECOMMENDATION_SYSTEM, "SNAPSHOT_DIR": directory}), \
+                mock.patch("core.server.recommendation_system._recommendation_system", None), \
+                mock.patch.object(worker, "_receive", side_effect=asyncio.CancelledError), \
+                mock.patch.object(RecommendationSystem, "_fit", autospec=True, side_effect=RecommendationSystem._fit) \
+                as fit:
+            with self.assertRaises(asyncio.CancelledError):
+                async_to_sync(worker.run)()
+
+            return worker.recommendation_system, len([call for call in fit.call_args_list if len(call.args[2]) != 0])
+
+    def test_worker_start_without_snapshot(self):
+        with tempfile.TemporaryDirectory() as directory:
+            recommendation_system, fits = self._start(directory)
+
+        self.assertEqual(fits, 1)
+        self.assertEqual(len(recommendation_system.snapshot.ids), 5)
+
+    def test_worker_start_with_snapshot(self):
+        with tempfile.TemporaryDirectory() as directory:
+            RecommendationSystem(n=3, rooms=get_rooms_data()).save(directory)
+
+            recommendation_system, fits = self._start(directory)
+
+        self.assertEqual(fits, 0)
+        self.assertEqual(recommendation_system.version, 1)
+        self.assertEqual(len(recommendation_system.snapshot.ids), 5)
@@ -121,3 +121,31 @@ class RoomTest(TestCase):
         after_deleting = Room.objects.count()
 
         self.assertGreater(before_deleting, after_deleting)
+
+    def test_room_summaries(self):
+        room = Room.objects.get(pk=1)
+
+        with self.assertNumQueries(1):
+            summaries, cursor = Room.objects.get_summaries(limit=10)
+
+        self.assertEqual(summaries, [{
+            "id": room.id,
+            "title": room.title,
+            "count_of_participants": 1,
+            "is_available": True
+        }])
+        self.assertIsNone(cursor)
+
+    def test_room_summaries_are_bounded(self):
+        room = Room.objects.get(pk=1)
+        other = Room.objects.create(host=room.host, topic=room.topic, **ROOMS["only english"])
+
+        summaries, cursor = Room.objects.get_summaries(limit=1)
+
+        self.assertEqual([summary["id"] for summary in summaries], [other.id])
+        self.assertEqual(cursor, other.id)
+
+        summaries, cursor = Room.objects.get_summaries(limit=1, cursor=cursor)
+
+        self.assertEqual([summary["id"] for summary in summaries], [room.id])
+        self.assertIsNone(cursor)
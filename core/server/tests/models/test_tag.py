@@ -1,8 +1,11 @@
+from unittest import mock
+
 from django.core.exceptions import ValidationError
 from django.test import TestCase
 
 from core.server.models import Room, Tag, Topic, User
 from core.server.tests import ROOMS, TAGS, TOPICS, USERS
+from core.server.utils import RecommendationUtils
 
 
 class TagTest(TestCase):
@@ -55,3 +58,18 @@ class TagTest(TestCase):
         after_deleting = Tag.objects.count()
 
         self.assertGreater(before_deleting, after_deleting)
+
+    def test_tag_creation_updates_recommendations_on_commit(self):
+        room = Room.objects.get(pk=1)
+
+        with mock.patch.object(RecommendationUtils, "_send") as send:
+            with self.captureOnCommitCallbacks(execute=True):
+                Tag.objects.create(room=room, name="gaming")
+
+                send.assert_not_called()
+
+        send.assert_called_once_with({
+            "type": "recommendations.rooms",
+            "rooms": [{"id": room.id, "topic": room.topic.title, "language": room.language, "tags": "english,gaming"}],
+            "removed": []
+        })
@@ -1,5 +1,7 @@
 from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+from rest_framework_simplejwt.tokens import AccessToken
 
+from core.server.authentication import TokenCache, get_token_cache
 from core.server.models import User
 from core.server.tests import PATHS, USERS
 from core.server.views import AuthorizationView, DeauthorizationView, RegistrationView
@@ -199,3 +201,49 @@ class DeauthorizationViewTest(APITestCase):
         response = DeauthorizationView().as_view()(request)
 
         self.assertEqual(response.status_code, 403)
+
+
+class TokenCacheTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user(**USERS["user"])
+
+    def setUp(self):
+        self.user = User.objects.get(pk=1)
+        self.cache = get_token_cache()
+        self.cache.clear()
+
+    def test_token_decoded_once_per_request(self):
+        self.client.cookies["access_token"] = str(AccessToken.for_user(self.user))
+
+        metrics = self.cache.get_metrics()
+        response = self.client.get(path=PATHS["profile"])
+
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.cache.get_metrics()["misses"] - metrics["misses"], 1)
+        self.assertEqual(self.cache.get_metrics()["hits"] - metrics["hits"], 1)
+
+    def test_invalid_token_not_cached(self):
+        self.client.cookies["access_token"] = f"{AccessToken.for_user(self.user)}x"
+
+        response = self.client.get(path=PATHS["profile"])
+
+        self.assertEqual(response.status_code, 401)
+
+        self.assertEqual(self.cache.get_metrics()["size"], 0)
+
+    def test_token_cache_eviction(self):
+        cache = TokenCache(max_size=1)
+        tokens = [str(AccessToken.for_user(self.user)) for _ in range(2)]
+
+        for token in tokens:
+            cache.get_validated_token(token)
+
+        self.assertEqual(cache.get_metrics()["size"], 1)
+        self.assertEqual(cache.get_metrics()["evicted"], 1)
+
+        cache.get_validated_token(tokens[1])
+
+        self.assertEqual(cache.get_metrics()["hits"], 1)
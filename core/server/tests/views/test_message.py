@@ -1,6 +1,12 @@
+import asyncio
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.layers import get_channel_layer
 from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
 
-from core.server.models import Message, Room, Topic, User
+from core.server.dispatcher import EventDispatcher
+from core.server.models import Message, Notification, Room, Topic, User
 from core.server.tests import MESSAGES, PATHS, ROOMS, TOPICS, USERS
 from core.server.views import MessageListView, MessageView
 
@@ -27,6 +33,68 @@ class MessageListViewTest(APITestCase):
 
         self.assertEqual(response.status_code, 200)
 
+    def test_get_messages_with_constant_number_of_queries(self):
+        reply_to = self.message
+
+        for _ in range(5):
+            reply_to = Message.objects.create(room=self.room, author=self.user, reply_to=reply_to, **MESSAGES["reply"])
+
+        request = self.factory.get(path=PATHS["messages"], format="json")
+        force_authenticate(request=request, user=self.user)
+
+        with self.assertNumQueries(1):
+            response = MessageListView().as_view()(request, room=self.room.title)
+
+        self.assertEqual(response.status_code, 200)
+
+        messages = response.data["results"]
+
+        self.assertEqual(len(messages), 6)
+        self.assertEqual(messages[-1]["room"], self.room.id)
+        self.assertEqual(messages[-1]["reply_to"]["id"], messages[-2]["id"])
+        self.assertEqual(messages[-1]["reply_to"]["reply_to"], messages[-3]["id"])
+
+    def test_get_messages_with_cursors(self):
+        for _ in range(4):
+            Message.objects.create(room=self.room, author=self.user, **MESSAGES["reply"])
+
+        request = self.factory.get(path=PATHS["messages"], data={"page_size": 2}, format="json")
+        force_authenticate(request=request, user=self.user)
+        response = MessageListView().as_view()(request, room=self.room.title)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([message["id"] for message in response.data["results"]], [4, 5])
+        self.assertIsNone(response.data["next"])
+
+        request = self.factory.get(path=response.data["previous"], format="json")
+        force_authenticate(request=request, user=self.user)
+        response = MessageListView().as_view()(request, room=self.room.title)
+
+        self.assertEqual([message["id"] for message in response.data["results"]], [2, 3])
+        self.assertIsNotNone(response.data["previous"])
+
+        request = self.factory.get(path=response.data["next"], format="json")
+        force_authenticate(request=request, user=self.user)
+        response = MessageListView().as_view()(request, room=self.room.title)
+
+        self.assertEqual([message["id"] for message in response.data["results"]], [4, 5])
+        self.assertIsNone(response.data["next"])
+
+    def test_get_messages_without_pagination(self):
+        request = self.factory.get(path=PATHS["messages"], data={"no_pagination": True}, format="json")
+        force_authenticate(request=request, user=self.user)
+        response = MessageListView().as_view()(request, room=self.room.title)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+
+    def test_get_messages_with_invalid_cursor(self):
+        request = self.factory.get(path=PATHS["messages"], data={"before": "invalid"}, format="json")
+        force_authenticate(request=request, user=self.user)
+        response = MessageListView().as_view()(request, room=self.room.title)
+
+        self.assertEqual(response.status_code, 404)
+
     def test_get_messages_if_not_authenticated(self):
         request = self.factory.get(path=PATHS["messages"], format="json")
         response = MessageListView().as_view()(request, room=self.room.title)
@@ -44,6 +112,55 @@ class MessageListViewTest(APITestCase):
 
         self.assertEqual(response.status_code, 201)
 
+    def _create_message(self):
+        data = {
+            "text": MESSAGES["greetings"]["text"]
+        }
+
+        request = self.factory.post(path=PATHS["messages"], data=data, format="multipart")
+        force_authenticate(request=request, user=self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            return MessageListView().as_view()(request, room=self.room.title)
+
+    def test_create_message_sends_event_on_commit(self):
+        channel_layer = get_channel_layer()
+        channel = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)(f"room-{self.room.id}", channel)
+
+        dispatcher = EventDispatcher()
+
+        with mock.patch("core.server.dispatcher._event_dispatcher", dispatcher):
+            response = self._create_message()
+
+        self.assertEqual(response.status_code, 201)
+
+        event = async_to_sync(channel_layer.receive)(channel)
+
+        self.assertEqual(event["type"], "message_send")
+        self.assertEqual(event["message"]["text"], MESSAGES["greetings"]["text"])
+        self.assertEqual(dispatcher.get_metrics()["delivered"], 1)
+
+        async_to_sync(channel_layer.group_discard)(f"room-{self.room.id}", channel)
+
+    async def test_create_message_sends_event_on_server_loop(self):
+        channel_layer = get_channel_layer()
+        channel = await channel_layer.new_channel()
+        await channel_layer.group_add(f"room-{self.room.id}", channel)
+
+        dispatcher = EventDispatcher()
+
+        with mock.patch("core.server.dispatcher._event_dispatcher", dispatcher):
+            response = await sync_to_async(self._create_message)()
+            event = await asyncio.wait_for(channel_layer.receive(channel), timeout=1)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(event["type"], "message_send")
+        self.assertEqual(event["message"]["text"], MESSAGES["greetings"]["text"])
+        self.assertIs(dispatcher._loop, asyncio.get_running_loop())
+
+        await channel_layer.group_discard(f"room-{self.room.id}", channel)
+
     def test_create_message_if_not_authenticated(self):
         data = {
             "text": MESSAGES["greetings"]["text"]
@@ -65,6 +182,44 @@ class MessageListViewTest(APITestCase):
 
         self.assertEqual(response.status_code, 404)
 
+    def test_create_message_with_mentions_and_reply(self):
+        admin = User.objects.create_user(**USERS["admin"])
+        test = User.objects.create_user(**USERS["test"])
+        self.message.author = test
+        self.message.save()
+
+        data = {
+            "text": f"@{admin.username} @{test.username} @{self.user.username} @unknown",
+            "reply_to": self.message.id
+        }
+
+        request = self.factory.post(path=PATHS["messages"], data=data, format="multipart")
+        force_authenticate(request=request, user=self.user)
+        response = MessageListView().as_view()(request, room=self.room.title)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            sorted(Notification.objects.values_list("recipient", "notification_type")),
+            [(admin.id, Notification.NotificationType.MENTION), (test.id, Notification.NotificationType.MENTION)]
+        )
+
+        Notification.objects.all().delete()
+
+        data = {
+            "text": MESSAGES["reply"]["text"],
+            "reply_to": self.message.id
+        }
+
+        request = self.factory.post(path=PATHS["messages"], data=data, format="multipart")
+        force_authenticate(request=request, user=self.user)
+        response = MessageListView().as_view()(request, room=self.room.title)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            list(Notification.objects.values_list("recipient", "notification_type")),
+            [(test.id, Notification.NotificationType.MESSAGE_REPLY)]
+        )
+
 
 class MessageViewTest(APITestCase):
 
@@ -1,8 +1,17 @@
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.test import override_settings
+from django.utils import timezone
 from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
 
-from core.server.models import Message, Notification, Room, Topic, User
-from core.server.tests import MESSAGES, NOTIFICATIONS, PATHS, ROOMS, TOPICS, USERS
-from core.server.views import NotificationListView, NotificationView
+from core.server.dispatcher import EventDispatcher
+from core.server.models import Message, Notification, Report, Room, Topic, User
+from core.server.tests import MESSAGES, NOTIFICATIONS, PATHS, REPORTS, ROOMS, TOPICS, USERS
+from core.server.utils import WebSocketUtils
+from core.server.views import NotificationListView, NotificationView, UnreadNotificationCountView
 
 
 class NotificationListViewTest(APITestCase):
@@ -12,8 +21,14 @@ class NotificationListViewTest(APITestCase):
         user = User.objects.create_user(**USERS["user"])
         topic = Topic.objects.create(**TOPICS["chatting"])
         room = Room.objects.create(host=user, topic=topic, **ROOMS["just speak"])
-        Message.objects.create(room=room, author=user, **MESSAGES["greetings"])
-        Notification.objects.create(recipient=user, **NOTIFICATIONS["message reply"])
+        message = Message.objects.create(room=room, author=user, **MESSAGES["greetings"])
+        Notification.objects.create(
+            recipient=user,
+            room=room,
+            user=user,
+            message=message,
+            **NOTIFICATIONS["message reply"]
+        )
 
     def setUp(self):
         self.factory = APIRequestFactory()
@@ -27,6 +42,155 @@ class NotificationListViewTest(APITestCase):
 
         self.assertEqual(response.status_code, 200)
 
+    def test_get_notifications_with_constant_number_of_queries(self):
+        users = User.objects.bulk_create([
+            User(username=f"user{i}", email=f"user{i}@virnect.ua") for i in range(5)
+        ])
+        messages = Message.objects.bulk_create([
+            Message(room=self.notification.room, author=user, reply_to=self.notification.message, **MESSAGES["reply"])
+            for user in users
+        ])
+        reports = Report.objects.bulk_create([
+            Report(sender=self.user, accused=user, **REPORTS["text abuse"]) for user in users
+        ])
+
+        Notification.objects.bulk_create([
+            Notification(
+                recipient=self.user,
+                notification_type=Notification.NotificationType.MENTION,
+                room=self.notification.room,
+                user=users[i % 5]
+            )
+            for i in range(20)
+        ] + [
+            Notification(
+                recipient=self.user,
+                notification_type=Notification.NotificationType.MESSAGE_REPLY,
+                room=self.notification.room,
+                user=users[i % 5],
+                message=messages[i % 5]
+            )
+            for i in range(20)
+        ] + [
+            Notification(recipient=self.user, notification_type=Notification.NotificationType.REPORT,
+                         report=reports[i % 5])
+            for i in range(10)
+        ])
+
+        request = self.factory.get(path=PATHS["notifications"], data={"page_size": 100}, format="json")
+        force_authenticate(request=request, user=self.user)
+
+        with self.assertNumQueries(5):
+            response = NotificationListView().as_view()(request)
+
+        self.assertEqual(response.data["count"], 51)
+        self.assertEqual(len(response.data["results"]), 51)
+
+    def test_get_notifications_with_pagination(self):
+        Notification.objects.bulk_create([
+            Notification(recipient=self.user, room=self.notification.room, user=self.user, notification_type=0)
+            for _ in range(24)
+        ])
+
+        request = self.factory.get(path=PATHS["notifications"], format="json")
+        force_authenticate(request=request, user=self.user)
+        response = NotificationListView().as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 25)
+        self.assertEqual(len(response.data["results"]), 20)
+        self.assertIsNotNone(response.data["next"])
+
+        request = self.factory.get(path=PATHS["notifications"], data={"no_pagination": True}, format="json")
+        force_authenticate(request=request, user=self.user)
+        response = NotificationListView().as_view()(request)
+
+        self.assertEqual(len(response.data), 25)
+
+    def test_get_notifications_without_stale_notifications(self):
+        Message.objects.get(pk=1).delete()
+
+        request = self.factory.get(path=PATHS["notifications"], format="json")
+        force_authenticate(request=request, user=self.user)
+        response = NotificationListView().as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 0)
+
+    @override_settings(WEBSOCKET_DISPATCH={**settings.WEBSOCKET_DISPATCH, "MODE": "sync"})
+    def test_view_notifications_by_ids(self):
+        other = User.objects.create_user(**USERS["test"])
+        notifications = Notification.objects.bulk_create([
+            Notification(recipient=recipient, room=self.notification.room, user=self.user, notification_type=0)
+            for recipient in (self.user, self.user, other)
+        ])
+
+        channel_layer = get_channel_layer()
+        channel = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)(f"profile-{self.user.id}", channel)
+
+        data = {
+            "ids": [self.notification.id, notifications[0].id, notifications[2].id]
+        }
+
+        request = self.factory.patch(path=PATHS["notifications"], data=data, format="json")
+        force_authenticate(request=request, user=self.user)
+
+        with self.assertNumQueries(2):
+            response = NotificationListView().as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["viewed"], 2)
+
+        self.assertEqual(Notification.objects.get_unread_count(recipient=self.user), 1)
+        self.assertEqual(Notification.objects.get_unread_count(recipient=other), 1)
+
+        event = async_to_sync(channel_layer.receive)(channel)
+
+        self.assertEqual(event, {"type": "notification_list_update", "unread": 1})
+
+        async_to_sync(channel_layer.group_discard)(f"profile-{self.user.id}", channel)
+
+    def test_view_notifications_before(self):
+        Notification.objects.create(recipient=self.user, room=self.notification.room, user=self.user,
+                                    notification_type=0)
+        Notification.objects.filter(pk=1).update(created_at=timezone.now() - timedelta(days=1))
+
+        data = {
+            "before": (timezone.now() - timedelta(hours=1)).isoformat()
+        }
+
+        request = self.factory.patch(path=PATHS["notifications"], data=data, format="json")
+        force_authenticate(request=request, user=self.user)
+        response = NotificationListView().as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["viewed"], 1)
+
+        self.assertTrue(Notification.objects.get(pk=1).is_viewed)
+        self.assertFalse(Notification.objects.get(pk=2).is_viewed)
+
+    def test_view_all_notifications(self):
+        Notification.objects.create(recipient=self.user, room=self.notification.room, user=self.user,
+                                    notification_type=0)
+        Notification.objects.filter(pk=2).update(created_at=timezone.now() + timedelta(hours=1))
+
+        request = self.factory.patch(path=PATHS["notifications"], data={"all": True}, format="json")
+        force_authenticate(request=request, user=self.user)
+        response = NotificationListView().as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["viewed"], 2)
+        self.assertEqual(Notification.objects.get_unread_count(recipient=self.user), 0)
+
+    def test_view_notifications_without_ids_and_before(self):
+        for data in ({}, {"all": False}):
+            request = self.factory.patch(path=PATHS["notifications"], data=data, format="json")
+            force_authenticate(request=request, user=self.user)
+            response = NotificationListView().as_view()(request)
+
+            self.assertEqual(response.status_code, 400)
+
     def test_get_notifications_if_not_authenticated(self):
         request = self.factory.get(path=PATHS["notifications"], format="json")
         response = NotificationListView().as_view()(request)
@@ -41,8 +205,14 @@ class NotificationViewTest(APITestCase):
         user = User.objects.create_user(**USERS["user"])
         topic = Topic.objects.create(**TOPICS["chatting"])
         room = Room.objects.create(host=user, topic=topic, **ROOMS["just speak"])
-        Message.objects.create(room=room, author=user, **MESSAGES["greetings"])
-        Notification.objects.create(recipient=user, **NOTIFICATIONS["message reply"])
+        message = Message.objects.create(room=room, author=user, **MESSAGES["greetings"])
+        Notification.objects.create(
+            recipient=user,
+            room=room,
+            user=user,
+            message=message,
+            **NOTIFICATIONS["message reply"]
+        )
 
     def setUp(self):
         self.factory = APIRequestFactory()
@@ -93,3 +263,71 @@ class NotificationViewTest(APITestCase):
         response = NotificationView().as_view()(request, pk=self.notification.id + 1)
 
         self.assertEqual(response.status_code, 404)
+
+
+class UnreadNotificationCountViewTest(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(**USERS["user"])
+        Notification.objects.create(recipient=user, content="{\"promoted\": true}", notification_type=4)
+        Notification.objects.create(recipient=user, content="{\"promoted\": false}", notification_type=4)
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User.objects.get(pk=1)
+
+    def test_get_unread_count(self):
+        Notification.objects.filter(pk=1).update(is_viewed=True)
+
+        request = self.factory.get(path=PATHS["unread-notifications"], format="json")
+        force_authenticate(request=request, user=self.user)
+
+        with self.assertNumQueries(1):
+            response = UnreadNotificationCountView().as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"unread": 1})
+
+    def test_get_unread_count_if_not_authenticated(self):
+        request = self.factory.get(path=PATHS["unread-notifications"], format="json")
+        response = UnreadNotificationCountView().as_view()(request)
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_notification_list_updates_coalesced_to_final_unread_count(self):
+        channel_layer = get_channel_layer()
+        channel = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)(f"profile-{self.user.id}", channel)
+
+        dispatcher = EventDispatcher()
+        dispatcher.dispatch([
+            (f"profile-{self.user.id}", {"type": "notification_list_update", "unread": unread}) for unread in (3, 2, 3)
+        ])
+
+        self.assertEqual(async_to_sync(channel_layer.receive)(channel)["unread"], 2)
+        self.assertEqual(async_to_sync(channel_layer.receive)(channel)["unread"], 3)
+        self.assertEqual(dispatcher.get_metrics()["coalesced"], 1)
+
+        async_to_sync(channel_layer.group_discard)(f"profile-{self.user.id}", channel)
+
+        edits = [("room-1", {"type": "message_edit", "message": {"id": 1, "text": text}}) for text in "ABA"]
+
+        self.assertEqual(
+            [event["message"]["text"] for event in dispatcher._coalesce([(0, edits)])["room-1"]],
+            ["B", "A"]
+        )
+
+    @override_settings(WEBSOCKET_DISPATCH={**settings.WEBSOCKET_DISPATCH, "MODE": "sync"})
+    def test_notification_list_update_carries_unread_count(self):
+        channel_layer = get_channel_layer()
+        channel = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)(f"profile-{self.user.id}", channel)
+
+        WebSocketUtils.update_notification_list(user_id=self.user.id)
+
+        event = async_to_sync(channel_layer.receive)(channel)
+
+        self.assertEqual(event, {"type": "notification_list_update", "unread": 2})
+
+        async_to_sync(channel_layer.group_discard)(f"profile-{self.user.id}", channel)
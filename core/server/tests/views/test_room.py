@@ -1,7 +1,20 @@
+import asyncio
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
 from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
-
-from core.server.models import Room, Topic, User
-from core.server.tests import PATHS, ROOMS, TOPICS, USERS
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.server.consumers import RoomListConsumer
+from core.server.dispatcher import EventDispatcher
+from core.server.models import History, Room, Tag, Topic, User
+from core.server.room_state import InMemoryRoomStateStore, create_room_state_store
+from core.server.tests import HISTORIES, PATHS, ROOMS, TAGS, TOPICS, USERS
+from core.server.utils import WebSocketUtils
 from core.server.views import RoomListView, RoomView
 
 
@@ -34,6 +47,52 @@ class RoomListViewTest(APITestCase):
 
         self.assertEqual(response.status_code, 403)
 
+    @override_settings(RECOMMENDATION_SYSTEM={**settings.RECOMMENDATION_SYSTEM, "SNAPSHOT_DIR": None})
+    def test_get_rooms_with_recommendations(self):
+        from core.server.workers import RecommendationWorker
+
+        for i in range(4):
+            room = Room.objects.create(host=self.user, topic=self.topic, title=f"room#{i}")
+            Tag.objects.create(room=room, **TAGS["english" if i % 2 else "gaming"])
+
+        Tag.objects.create(room=self.room, **TAGS["english"])
+
+        for _ in range(5):
+            History.objects.create(owner=self.test, **{**HISTORIES["1970-01-01T00:00:00.0Z"], "language": "UN"})
+
+        worker = RecommendationWorker(workers=0)
+        worker.train()
+
+        self.assertEqual(worker.update_users(), 1)
+
+        request = self.factory.get(path=PATHS["rooms"], data={"no_pagination": True}, format="json")
+        force_authenticate(request=request, user=self.test)
+        response = RoomListView().as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(response.data[0]["recommendation_rating"], 0)
+        self.assertIn("english", [tag["name"] for tag in response.data[0]["tags"]])
+
+    def test_get_rooms_with_constant_number_of_queries(self):
+        for i in range(4):
+            room = Room.objects.create(host=self.test, topic=self.topic, title=f"room#{i}")
+            room.participants.add(self.user, self.test)
+            Tag.objects.create(room=room, **TAGS["english"])
+            Tag.objects.create(room=room, **TAGS["gaming"])
+
+        for data in ({}, {"no_pagination": True}):
+            request = self.factory.get(path=PATHS["rooms"], data=data, format="json")
+            force_authenticate(request=request, user=self.user)
+
+            with self.assertNumQueries(4 if len(data) == 0 else 3):
+                response = RoomListView().as_view()(request)
+
+            self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual([tag["name"] for tag in response.data[0]["tags"]], ["english", "gaming"])
+        self.assertEqual(response.data[0]["participants"][0]["id"], self.test.id)
+
     def test_create_room(self):
         data = {
             "host": self.user.id,
@@ -125,6 +184,118 @@ class RoomViewTest(APITestCase):
 
         self.assertEqual(response.status_code, 200)
 
+    @override_settings(WEBSOCKET_DISPATCH={**settings.WEBSOCKET_DISPATCH, "MODE": "sync"})
+    def test_update_room_sends_room_list_delta(self):
+        channel_layer = get_channel_layer()
+        channel = async_to_sync(channel_layer.new_channel)()
+        async_to_sync(channel_layer.group_add)("room-list", channel)
+
+        data = {
+            "title": ROOMS["only english"]["title"],
+            "key": ""
+        }
+
+        request = self.factory.patch(path=PATHS["room"], data=data, format="json")
+        force_authenticate(request=request, user=self.user)
+        response = RoomView().as_view()(request, title=self.room.title)
+
+        self.assertEqual(response.status_code, 200)
+
+        event = async_to_sync(channel_layer.receive)(channel)
+
+        self.assertEqual(event, {
+            "type": "room_list_update",
+            "created": [],
+            "updated": [{"id": self.room.id, "title": ROOMS["only english"]["title"], "is_open": True}],
+            "participants": [],
+            "deleted": []
+        })
+
+        async_to_sync(channel_layer.group_discard)("room-list", channel)
+
+    def _update_room(self, title):
+        data = {
+            "title": title,
+            "key": ""
+        }
+
+        request = self.factory.patch(path=PATHS["room"], data=data, format="json")
+        force_authenticate(request=request, user=self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            return RoomView().as_view()(request, title=Room.objects.get(pk=self.room.id).title)
+
+    @override_settings(WEBSOCKET_DISPATCH={**settings.WEBSOCKET_DISPATCH, "ROOM_LIST_WINDOW": 0.1})
+    async def test_update_room_debounces_room_list_delta(self):
+        channel_layer = get_channel_layer()
+        channel = await channel_layer.new_channel()
+        await channel_layer.group_add("room-list", channel)
+
+        dispatcher = EventDispatcher()
+
+        with mock.patch("core.server.dispatcher._event_dispatcher", dispatcher):
+            for title in (ROOMS["only english"]["title"], ROOMS["just speak"]["title"]):
+                response = await sync_to_async(self._update_room)(title)
+
+                self.assertEqual(response.status_code, 200)
+
+            event = await asyncio.wait_for(channel_layer.receive(channel), timeout=1)
+
+        self.assertEqual(event["updated"], [
+            {"id": self.room.id, "title": ROOMS["just speak"]["title"], "is_open": True}
+        ])
+        self.assertEqual(dispatcher.get_metrics()["debounced"], 1)
+
+        await channel_layer.group_discard("room-list", channel)
+
+    def test_merge_room_list_updates(self):
+        event = {"type": "room_list_update", "created": [], "updated": [], "participants": [], "deleted": []}
+
+        event = WebSocketUtils._merge_room_list_updates(
+            {**event, "created": [{"id": 3, "title": "c"}], "updated": [{"id": 1, "title": "a"}, {"id": 2}]},
+            {**event, "updated": [{"id": 3, "title": "d"}], "participants": [{"id": 1, "count_of_participants": 2}]}
+        )
+        event = WebSocketUtils._merge_room_list_updates(event, {**event, "updated": [], "deleted": [2]})
+
+        self.assertEqual(event["created"], [{"id": 3, "title": "d"}])
+        self.assertEqual(event["updated"], [{"id": 1, "title": "a"}])
+        self.assertEqual(event["participants"], [{"id": 1, "count_of_participants": 2}])
+        self.assertEqual(event["deleted"], [2])
+
+    @override_settings(WEBSOCKET_DISPATCH={**settings.WEBSOCKET_DISPATCH, "ROOM_LIST_SNAPSHOT_SIZE": 1})
+    async def test_room_list_snapshot(self):
+        other = await sync_to_async(Room.objects.create)(host=self.user, topic=self.topic, **ROOMS["only english"])
+
+        communicator = WebsocketCommunicator(RoomListConsumer.as_asgi(), "/ws/room-list/")
+        communicator.scope["cookies"] = {"access_token": str(AccessToken.for_user(self.user))}
+
+        connected, _ = await communicator.connect()
+
+        self.assertTrue(connected)
+        self.assertEqual(await communicator.receive_json_from(), {
+            "type": "room_list_snapshot",
+            "rooms": [{"id": other.id, "title": other.title, "count_of_participants": 0, "is_available": True}],
+            "cursor": None,
+            "next": other.id
+        })
+
+        await communicator.send_json_to({"type": "room_list_snapshot", "cursor": other.id})
+
+        self.assertEqual(await communicator.receive_json_from(), {
+            "type": "room_list_snapshot",
+            "rooms": [
+                {"id": self.room.id, "title": self.room.title, "count_of_participants": 0, "is_available": True}
+            ],
+            "cursor": other.id,
+            "next": None
+        })
+
+        await communicator.send_json_to({"type": "room_list_snapshot", "cursor": "1"})
+
+        self.assertTrue(await communicator.receive_nothing())
+
+        await communicator.disconnect()
+
     def test_update_room_if_not_authenticated(self):
         data = {
             "title": ROOMS["only english"]["title"],
@@ -184,3 +355,77 @@ class RoomViewTest(APITestCase):
         response = RoomView().as_view()(request, title=self.room.title)
 
         self.assertEqual(response.status_code, 403)
+
+
+class RoomStateStoreTest(SimpleTestCase):
+
+    def setUp(self):
+        self.store = InMemoryRoomStateStore(ttl=60)
+
+    async def test_kick_user(self):
+        await self.store.kick_user("room-1", 1)
+
+        self.assertTrue(await self.store.is_kicked("room-1", 1))
+        self.assertFalse(await self.store.is_kicked("room-1", 2))
+        self.assertFalse(await self.store.is_kicked("room-2", 1))
+
+        await self.store.clear_kicked_users("room-1")
+
+        self.assertFalse(await self.store.is_kicked("room-1", 1))
+
+    async def test_voice_chat_users(self):
+        await self.store.add_voice_chat_user("room-1", {"id": 1, "username": "user", "is_muted": False})
+        await self.store.add_voice_chat_user("room-1", {"id": 2, "username": "test", "is_muted": False})
+        await self.store.add_voice_chat_user("room-1", {"id": 1, "username": "user", "is_muted": True})
+
+        await self.store.update_voice_chat_user("room-1", 2, is_muted=True)
+        await self.store.update_voice_chat_user("room-1", 3, is_muted=True)
+
+        self.assertEqual(await self.store.get_voice_chat_users("room-1"), [
+            {"id": 1, "username": "user", "is_muted": False},
+            {"id": 2, "username": "test", "is_muted": True}
+        ])
+
+        users = await self.store.get_voice_chat_users("room-1")
+        users[0]["is_muted"] = True
+
+        self.assertFalse((await self.store.get_voice_chat_users("room-1"))[0]["is_muted"])
+
+        await self.store.remove_voice_chat_user("room-1", 1)
+
+        self.assertEqual([user["id"] for user in await self.store.get_voice_chat_users("room-1")], [2])
+
+    async def test_state_dropped_when_room_empties(self):
+        await self.store.kick_user("room-1", 1)
+        await self.store.add_voice_chat_user("room-1", {"id": 2})
+
+        await self.store.remove_voice_chat_user("room-1", 2)
+
+        self.assertIn("room-1", self.store._expires_at)
+
+        await self.store.clear_kicked_users("room-1")
+
+        self.assertEqual(self.store._kicked_users, dict())
+        self.assertEqual(self.store._voice_chat_users, dict())
+        self.assertEqual(self.store._expires_at, dict())
+
+    async def test_state_expiry(self):
+        with mock.patch("core.server.room_state.time.monotonic", return_value=1000):
+            await self.store.kick_user("room-1", 1)
+            await self.store.add_voice_chat_user("room-1", {"id": 2})
+
+        with mock.patch("core.server.room_state.time.monotonic", return_value=1030):
+            await self.store.kick_user("room-2", 1)
+
+            self.assertTrue(await self.store.is_kicked("room-1", 1))
+
+        with mock.patch("core.server.room_state.time.monotonic", return_value=1060):
+            self.assertFalse(await self.store.is_kicked("room-1", 1))
+            self.assertEqual(await self.store.get_voice_chat_users("room-1"), [])
+            self.assertTrue(await self.store.is_kicked("room-2", 1))
+
+        self.assertEqual(list(self.store._expires_at), ["room-2"])
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            create_room_state_store("unknown")
@@ -3,7 +3,8 @@ from django.urls import path
 from core.server.views import (AuthorizationView, DeauthorizationView, MessageListView, MessageView,
                                NotificationListView, NotificationView, PasswordResetConfirmView, PasswordResetView,
                                ProfileView, RegistrationView, ReportListView, ReportView, RoomListView, RoomView,
-                               StatisticsView, TagListView, TagView, TopicListView, TopicView, UserListView, UserView)
+                               StatisticsView, TagListView, TagView, TopicListView, TopicView,
+                               UnreadNotificationCountView, UserListView, UserView)
 
 urlpatterns = [
     path("sign-in/", AuthorizationView().as_view(), name="sign-in"),
@@ -14,6 +15,7 @@ urlpatterns = [
     path("profile/", ProfileView().as_view(), name="profile"),
     path("notifications/", NotificationListView().as_view(), name="notifications"),
     path("notification/<pk>/", NotificationView().as_view(), name="notification"),
+    path("unread-notifications/", UnreadNotificationCountView().as_view(), name="unread-notifications"),
     path("users/", UserListView().as_view(), name="users"),
     path("user/<username>/", UserView().as_view(), name="user"),
     path("reports/", ReportListView().as_view(), name="reports"),
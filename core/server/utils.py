@@ -1,16 +1,18 @@
+import asyncio
 import os
 import random
 
 from asgiref.sync import async_to_sync
+from channels.exceptions import ChannelFull
 from channels.layers import get_channel_layer
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.backends import TokenBackend
-from rest_framework_simplejwt.exceptions import TokenBackendError
+from rest_framework_simplejwt.exceptions import TokenError
 
 
 class ImageUtils:
@@ -85,12 +87,11 @@ class AuthorizationUtils:
         if token is None:
             return None
 
+        from .authentication import get_token_cache
+
         try:
-            user_id = TokenBackend(
-                algorithm=settings.SIMPLE_JWT["ALGORITHM"],
-                signing_key=settings.SIMPLE_JWT["SIGNING_KEY"]
-            ).decode(token)["user_id"]
-        except TokenBackendError:
+            user_id = get_token_cache().get_validated_token(token)["user_id"]
+        except TokenError:
             return None
 
         return user_id
@@ -149,18 +150,46 @@ class AuthorizationUtils:
 class WebSocketUtils:
 
     @staticmethod
-    def _send_to_group(group, event):
+    async def _send_to_groups(events):
         channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(group, event)
+        await asyncio.gather(*[channel_layer.group_send(group, event) for group, event in events])
+
+    @staticmethod
+    def _dispatch(events):
+        if len(events) == 0:
+            return None
+
+        if settings.WEBSOCKET_DISPATCH["MODE"] == "sync":
+            return async_to_sync(WebSocketUtils._send_to_groups)(events)
+
+        from .dispatcher import get_event_dispatcher
+
+        transaction.on_commit(lambda: get_event_dispatcher().dispatch(events))
+
+    @staticmethod
+    def _send_to_group(group, event):
+        WebSocketUtils._dispatch([(group, event)])
 
     @staticmethod
     def update_notification_list(user_id):
-        WebSocketUtils._send_to_group(
-            f"profile-{user_id}",
-            {
-                "type": "notification_list_update"
-            }
-        )
+        WebSocketUtils.update_notification_lists(user_ids=[user_id])
+
+    @staticmethod
+    def update_notification_lists(user_ids):
+        from .models import Notification
+
+        unread = Notification.objects.get_unread_counts(recipients=set(user_ids)) if len(user_ids) != 0 else dict()
+
+        WebSocketUtils._dispatch([
+            (
+                f"profile-{user_id}",
+                {
+                    "type": "notification_list_update",
+                    "unread": count
+                }
+            )
+            for user_id, count in unread.items()
+        ])
 
     @staticmethod
     def ban(user_id):
@@ -172,13 +201,61 @@ class WebSocketUtils:
         )
 
     @staticmethod
-    def update_room_list():
-        WebSocketUtils._send_to_group(
+    def _merge_room_list_updates(event, other):
+        deleted = set(event["deleted"]) | set(other["deleted"])
+        merged = {**event, "deleted": sorted(deleted)}
+
+        for delta in ("created", "updated", "participants"):
+            rooms = {room["id"]: room for room in event[delta]}
+
+            for room in other[delta]:
+                rooms[room["id"]] = {**rooms.get(room["id"], dict()), **room}
+
+            merged[delta] = [room for room_id, room in rooms.items() if room_id not in deleted]
+
+        created = {room["id"]: room for room in merged["created"]}
+
+        for room in merged["updated"]:
+            if room["id"] in created:
+                created[room["id"]].update(room)
+
+        merged["created"] = list(created.values())
+        merged["updated"] = [room for room in merged["updated"] if room["id"] not in created]
+
+        return merged
+
+    @staticmethod
+    def get_room_summary(room, count_of_participants):
+        return {
+            "id": room["id"],
+            "title": room["title"],
+            "count_of_participants": count_of_participants,
+            "is_available": count_of_participants < room["number_of_participants"]
+        }
+
+    @staticmethod
+    def update_room_list(created=(), updated=(), participants=(), deleted=()):
+        event = {
+            "type": "room_list_update",
+            "created": list(created),
+            "updated": list(updated),
+            "participants": list(participants),
+            "deleted": list(deleted)
+        }
+
+        window = settings.WEBSOCKET_DISPATCH["ROOM_LIST_WINDOW"]
+
+        if settings.WEBSOCKET_DISPATCH["MODE"] == "sync" or window == 0:
+            return WebSocketUtils._send_to_group("room-list", event)
+
+        from .dispatcher import get_event_dispatcher
+
+        transaction.on_commit(lambda: get_event_dispatcher().debounce(
             "room-list",
-            {
-                "type": "room_list_update"
-            }
-        )
+            event,
+            window=window,
+            merge=WebSocketUtils._merge_room_list_updates
+        ))
 
     @staticmethod
     def connect_room(room_id):
@@ -248,3 +325,48 @@ class WebSocketUtils:
                 "id": message_id
             }
         )
+
+
+class RecommendationUtils:
+
+    channel = "recommendations"
+
+    @staticmethod
+    def _send(event):
+        channel_layer = get_channel_layer()
+
+        try:
+            async_to_sync(channel_layer.send)(RecommendationUtils.channel, event)
+        except ChannelFull:
+            return None
+
+    @staticmethod
+    def _send_to_worker(event):
+        transaction.on_commit(lambda: RecommendationUtils._send(event))
+
+    @staticmethod
+    def get_room_data(room):
+        return {
+            "id": room.id,
+            "topic": room.topic.title,
+            "language": room.language,
+            "tags": ",".join([tag.name for tag in room.tag_set.all()])
+        }
+
+    @staticmethod
+    def update_rooms(rooms=(), removed=()):
+        if len(rooms) == 0 and len(removed) == 0:
+            return None
+
+        RecommendationUtils._send_to_worker({
+            "type": "recommendations.rooms",
+            "rooms": list(rooms),
+            "removed": list(removed)
+        })
+
+    @staticmethod
+    def update_users(user_ids):
+        RecommendationUtils._send_to_worker({
+            "type": "recommendations.users",
+            "users": list(user_ids)
+        })
@@ -1,6 +1,6 @@
 from .auth import AuthorizationView, DeauthorizationView, PasswordResetConfirmView, PasswordResetView, RegistrationView
 from .message import MessageListView, MessageView
-from .notification import NotificationListView, NotificationView
+from .notification import NotificationListView, NotificationView, UnreadNotificationCountView
 from .report import ReportListView, ReportView
 from .room import RoomListView, RoomView
 from .statistics import StatisticsView
@@ -1,4 +1,3 @@
-import json
 import re
 
 from rest_framework import status
@@ -6,16 +5,66 @@ from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIV
 from rest_framework.permissions import IsAuthenticated
 
 from core.server.models import Message, Notification, Room, User
+from core.server.pagination import KeysetPagination
 from core.server.permissions import IsOwnerOrReadOnly
 from core.server.serializers import MessageSerializer
 from core.server.utils import WebSocketUtils
 
 
-class MessageListView(ListCreateAPIView):
+class MessageNotificationMixin:
 
-    queryset = Message.objects.all()
+    def notify(self, room, message, text, reply=False):
+        participants = set(room.participants.values_list("id", flat=True))
+        participants.add(message.author_id)
+
+        usernames = set(re.findall(r"@(\w+)", text))
+        mentioned_users = set(User.objects.filter(username__in=usernames).values_list("id", flat=True)) \
+            if len(usernames) != 0 else set()
+
+        notifications = [
+            Notification(
+                recipient_id=user_id,
+                notification_type=Notification.NotificationType.MENTION,
+                room=room,
+                user_id=message.author_id
+            )
+            for user_id in sorted(mentioned_users - participants)
+        ]
+
+        if reply and message.reply_to is not None:
+            user_id = message.reply_to.author_id
+
+            if user_id not in mentioned_users and user_id not in participants:
+                notifications.append(Notification(
+                    recipient_id=user_id,
+                    notification_type=Notification.NotificationType.MESSAGE_REPLY,
+                    room=room,
+                    user_id=message.author_id,
+                    message=message
+                ))
+
+        Notification.objects.bulk_create(notifications)
+
+        WebSocketUtils.update_notification_lists(
+            user_ids=[notification.recipient_id for notification in notifications]
+        )
+
+
+class MessageListView(MessageNotificationMixin, ListCreateAPIView):
+
+    queryset = Message.objects.select_related("author", "reply_to__author")
     serializer_class = MessageSerializer
     permission_classes = (IsAuthenticated,)
+    pagination_class = KeysetPagination
+
+    @property
+    def paginator(self):
+        no_pagination = self.request.query_params.get("no_pagination")
+
+        if no_pagination is not None:
+            return None
+
+        return super(MessageListView, self).paginator
 
     def get_queryset(self):
         queryset = super(MessageListView, self).get_queryset()
@@ -26,42 +75,18 @@ class MessageListView(ListCreateAPIView):
 
         if response.status_code == status.HTTP_201_CREATED:
             room = Room.objects.get(title=kwargs["room"])
-            message = Message.objects.get(pk=response.data["message"]["id"])
+            message = Message.objects.select_related("reply_to").get(pk=response.data["message"]["id"])
 
             WebSocketUtils.send_message(room_id=room.id, data=response.data["message"])
 
-            mentioned_users = User.objects.filter(username__in=re.findall(r"@(\w+)", request.data["text"]))
-
-            for user in mentioned_users:
-                if user.id != message.author.id and user not in room.participants.all():
-                    Notification.objects.create(
-                        recipient=user,
-                        notification_type=Notification.NotificationType.MENTION,
-                        content=json.dumps({"room": room.id, "user": message.author.id})
-                    )
-                    WebSocketUtils.update_notification_list(user_id=user.id)
-
-            if message.reply_to is not None and message.reply_to.author.id != message.author.id:
-                user = User.objects.get(pk=message.reply_to.author.id)
-
-                if user not in mentioned_users and user not in room.participants.all():
-                    Notification.objects.create(
-                        recipient=user,
-                        notification_type=Notification.NotificationType.MESSAGE_REPLY,
-                        content=json.dumps({
-                            "room": room.id,
-                            "user": message.author.id,
-                            "message": message.id
-                        })
-                    )
-                    WebSocketUtils.update_notification_list(user_id=user.id)
+            self.notify(room=room, message=message, text=request.data["text"], reply=True)
 
         return response
 
 
-class MessageView(RetrieveUpdateDestroyAPIView):
+class MessageView(MessageNotificationMixin, RetrieveUpdateDestroyAPIView):
 
-    queryset = Message.objects.all()
+    queryset = Message.objects.select_related("author", "reply_to__author")
     serializer_class = MessageSerializer
     permission_classes = (IsOwnerOrReadOnly,)
 
@@ -78,16 +103,13 @@ class MessageView(RetrieveUpdateDestroyAPIView):
 
             WebSocketUtils.edit_message(room_id=room.id, message_id=message.id, data=response.data["message"])
 
-            mentioned_users = User.objects.filter(username__in=re.findall(r"@(\w+)", request.data.get("text", "")))
+            if message.reply_to_id is None:
+                Notification.objects.filter(
+                    message=message,
+                    notification_type=Notification.NotificationType.MESSAGE_REPLY
+                ).delete()
 
-            for user in mentioned_users:
-                if user.id != message.author.id and user not in room.participants.all():
-                    Notification.objects.create(
-                        recipient=user,
-                        notification_type=Notification.NotificationType.MENTION,
-                        content=json.dumps({"room": room.id, "user": message.author.id})
-                    )
-                    WebSocketUtils.update_notification_list(user_id=user.id)
+            self.notify(room=room, message=message, text=request.data.get("text", ""))
 
         return response
 
@@ -1,60 +1,82 @@
-import json
-from datetime import timedelta
-
-from django.db.models import Q
-from django.utils import timezone
+from django.db.models import Prefetch
 from rest_framework.generics import ListAPIView, RetrieveUpdateAPIView
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from core.server.models import Message, Notification, Report, Room, User
-from core.server.serializers import NotificationSerializer
+from core.server.models import Notification, Room
+from core.server.pagination import NotificationPagination
+from core.server.serializers import NotificationSerializer, ViewingSerializer
+from core.server.utils import WebSocketUtils
 
 
 class NotificationListView(ListAPIView):
 
-    queryset = Notification.objects.all()
+    queryset = Notification.objects.with_targets().select_related(
+        "user", "message__author", "message__reply_to__author", "report__sender", "report__accused",
+        "report__reviewed_by"
+    ).prefetch_related(Prefetch("room", queryset=Room.objects.with_related()))
     serializer_class = NotificationSerializer
     permission_classes = (IsAuthenticated,)
+    pagination_class = NotificationPagination
+
+    @property
+    def paginator(self):
+        no_pagination = self.request.query_params.get("no_pagination")
+
+        if no_pagination is not None:
+            return None
+
+        return super(NotificationListView, self).paginator
 
     def get_queryset(self):
-        old_notifications = Notification.objects.filter(Q(created_at__lt=timezone.now() - timedelta(days=7)))
-        if old_notifications.exists():
-            old_notifications.delete()
+        queryset = super(NotificationListView, self).get_queryset()
 
-        for notification in Notification.objects.filter(recipient=self.request.user):
-            content = json.loads(notification.content)
+        return queryset.filter(recipient=self.request.user)
 
-            if notification.notification_type == Notification.NotificationType.MENTION:
-                room = Room.objects.get_or_none(pk=content["room"])
-                user = User.objects.get_or_none(pk=content["user"])
+    def patch(self, request, *args, **kwargs):
+        serializer = ViewingSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
-                if room is None or user is None:
-                    notification.delete()
-            elif notification.notification_type in (Notification.NotificationType.REPORT,
-                                                    Notification.NotificationType.WARNING):
-                report = Report.objects.get_or_none(pk=content["report"])
+        notifications = Notification.objects.filter(recipient=request.user, is_viewed=False)
 
-                if report is None:
-                    notification.delete()
-            elif notification.notification_type == Notification.NotificationType.MESSAGE_REPLY:
-                room = Room.objects.get_or_none(pk=content["room"])
-                user = User.objects.get_or_none(pk=content["user"])
-                message = Message.objects.get_or_none(pk=content["message"])
+        if serializer.validated_data.get("ids") is not None:
+            notifications = notifications.filter(id__in=serializer.validated_data["ids"])
 
-                if room is None or user is None or message is None or message.reply_to is None:
-                    notification.delete()
+        if serializer.validated_data.get("before") is not None:
+            notifications = notifications.filter(created_at__lt=serializer.validated_data["before"])
 
-        queryset = super(NotificationListView, self).get_queryset()
+        viewed = notifications.update(is_viewed=True)
 
-        return queryset.filter(recipient=self.request.user)
+        if viewed != 0:
+            WebSocketUtils.update_notification_list(user_id=request.user.id)
+
+        data = {
+            "viewed": viewed,
+            "details": "Notifications have been viewed."
+        }
+
+        return Response(data=data)
 
 
 class NotificationView(RetrieveUpdateAPIView):
 
-    queryset = Notification.objects.all()
+    queryset = Notification.objects.with_targets().select_related("room", "user", "message", "report")
     serializer_class = NotificationSerializer
     permission_classes = (IsAuthenticated,)
 
     def get_queryset(self):
         queryset = super(NotificationView, self).get_queryset()
         return queryset.filter(recipient=self.request.user)
+
+
+class UnreadNotificationCountView(APIView):
+
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request):
+        data = {
+            "unread": Notification.objects.get_unread_count(recipient=request.user)
+        }
+
+        return Response(data=data)
@@ -1,5 +1,3 @@
-import json
-
 from rest_framework import status
 from rest_framework.generics import ListCreateAPIView, RetrieveUpdateAPIView
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
@@ -44,7 +42,7 @@ class ReportView(RetrieveUpdateAPIView):
                     Notification.objects.create(
                         recipient=accused,
                         notification_type=Notification.NotificationType.WARNING,
-                        content=json.dumps({"report": report.id})
+                        report=report
                     )
                     WebSocketUtils.update_notification_list(user_id=accused.id)
 
@@ -64,7 +62,7 @@ class ReportView(RetrieveUpdateAPIView):
                     Notification.objects.create(
                         recipient=rep.sender,
                         notification_type=Notification.NotificationType.REPORT,
-                        content=json.dumps({"report": rep.id})
+                        report=rep
                     )
                     WebSocketUtils.update_notification_list(user_id=rep.sender.id)
 
@@ -1,19 +1,20 @@
-from django.db.models import Case, IntegerField, Value, When
+from django.db.models import FilteredRelation, Q
+from django.db.models.functions import Coalesce
 from rest_framework import status
 from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
 
 from core.server.filters import RoomFilter
-from core.server.models import History, Room
+from core.server.models import Room
 from core.server.permissions import IsOwnerOrReadOnly
-from core.server.serializers import HistorySerializer, RoomSerializer
+from core.server.serializers import RoomSerializer
 from core.server.utils import WebSocketUtils
 
 
 class RoomListView(ListCreateAPIView):
 
-    queryset = Room.objects.all()
+    queryset = Room.objects.with_related()
     serializer_class = RoomSerializer
     permission_classes = (IsAuthenticated,)
     filterset_class = RoomFilter
@@ -31,50 +32,35 @@ class RoomListView(ListCreateAPIView):
 
     def get_queryset(self):
         rooms = super(RoomListView, self).get_queryset()
-        history = History.objects.filter(owner=self.request.user)
 
-        if rooms.count() > 4 and history.count() > 4:
-            from core.server.recommendation_system import recommendation_system
+        rooms = rooms.annotate(
+            user_recommendation=FilteredRelation(
+                "recommendation",
+                condition=Q(recommendation__owner=self.request.user)
+            )
+        ).annotate(
+            recommendation_rating=Coalesce("user_recommendation__rating", 0)
+        ).order_by("-recommendation_rating", "-created_at")
 
-            serialized_rooms = RoomSerializer(
-                instance=rooms,
-                context={"request": self.request},
-                many=True
-            ).data
-
-            if recommendation_system.rooms != serialized_rooms:
-                recommendation_system.train(rooms=serialized_rooms)
-
-            serialized_history = HistorySerializer(
-                instance=history,
-                context={"request": self.request},
-                many=True
-            ).data
-
-            set_of_topics = set(room["topic"]["title"] for room in serialized_rooms)
-            set_of_languages = set(room["language"] for room in serialized_rooms)
+        return rooms
 
-            serialized_history = [
-                history for history in serialized_history
-                if history["topic"] in set_of_topics and history["language"] in set_of_languages
-            ][:10]
+    def perform_create(self, serializer):
+        super(RoomListView, self).perform_create(serializer)
 
-            recommendations = recommendation_system.get_recommendations(history=serialized_history)
+        room = serializer.instance
 
-            rooms = rooms.annotate(
-                recommendation_rating=Case(
-                    *[When(id=room_id, then=Value(room_rating)) for room_id, room_rating in recommendations.items()],
-                    output_field=IntegerField(),
-                )
-            ).order_by("-recommendation_rating", "-created_at")
-
-        return rooms
+        WebSocketUtils.update_room_list(created=[
+            WebSocketUtils.get_room_summary(
+                {"id": room.id, "title": room.title, "number_of_participants": room.number_of_participants},
+                count_of_participants=0
+            )
+        ])
 
 
 class RoomView(RetrieveUpdateDestroyAPIView):
 
     lookup_field = "title"
-    queryset = Room.objects.all()
+    queryset = Room.objects.with_related()
     serializer_class = RoomSerializer
     permission_classes = (IsOwnerOrReadOnly,)
 
@@ -84,8 +70,19 @@ class RoomView(RetrieveUpdateDestroyAPIView):
         response = super(RoomView, self).update(request, *args, **kwargs)
 
         if response.status_code == status.HTTP_200_OK:
+            changes = {
+                field: response.data["room"][field]
+                for field in ("title", "topic", "language", "number_of_participants") if field in request.data
+            }
+
+            if "key" in request.data:
+                changes["is_open"] = len(request.data["key"]) == 0
+
+            if "number_of_participants" in changes:
+                changes["is_available"] = len(room.participants.all()) < changes["number_of_participants"]
+
             WebSocketUtils.update_room(room_id=room.id, room_title=response.data["room"]["title"])
-            WebSocketUtils.update_room_list()
+            WebSocketUtils.update_room_list(updated=[{"id": room.id, **changes}])
 
         return response
 
@@ -96,6 +93,6 @@ class RoomView(RetrieveUpdateDestroyAPIView):
 
         if response.status_code == status.HTTP_204_NO_CONTENT:
             WebSocketUtils.delete_room(room_id=room.id)
-            WebSocketUtils.update_room_list()
+            WebSocketUtils.update_room_list(deleted=[room.id])
 
         return response
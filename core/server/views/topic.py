@@ -30,6 +30,6 @@ class TopicView(RetrieveUpdateDestroyAPIView):
             for room_id in related_rooms:
                 WebSocketUtils.delete_room(room_id=room_id)
 
-            WebSocketUtils.update_room_list()
+            WebSocketUtils.update_room_list(deleted=related_rooms)
 
         return response
@@ -0,0 +1,225 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Notification, Preference, Recommendation, Room, User
+from .recommendation_system import get_recommendation_system, get_rooms_data
+from .utils import RecommendationUtils
+
+
+class RecommendationWorker:
+
+    def __init__(self, interval=None, delay=None, workers=None, batch_size=None):
+        config = settings.RECOMMENDATION_SYSTEM
+
+        self.interval = interval if interval is not None else config["UPDATE_INTERVAL"]
+        self.delay = delay if delay is not None else config["UPDATE_DELAY"]
+        self.batch_size = batch_size if batch_size is not None else config["BATCH_SIZE"]
+        workers = workers if workers is not None else config["WORKERS"]
+        self._executor = ThreadPoolExecutor(max_workers=workers) if workers > 0 else None
+
+    @property
+    def recommendation_system(self):
+        return get_recommendation_system(train=False)
+
+    def _get_active_users(self, user_ids=None):
+        users = User.objects.filter(
+            Q(last_seen__gte=timezone.now() - timedelta(days=3)) | Q(last_seen__isnull=True),
+            is_active=True
+        )
+
+        if user_ids is not None:
+            users = users.filter(id__in=user_ids)
+
+        users = users.annotate(count_of_histories=Count("history")).filter(count_of_histories__gt=4)
+
+        return list(users.values_list("id", flat=True))
+
+    def _get_preferences(self, user_ids):
+        preferences = {preference.owner_id: preference for preference in Preference.objects.filter(owner__in=user_ids)}
+        missing = Preference.objects.seed_from_histories(
+            preferences=[Preference(owner_id=user_id) for user_id in user_ids if user_id not in preferences]
+        )
+
+        if len(missing) != 0:
+            Preference.objects.bulk_create(missing.values(), ignore_conflicts=True)
+            preferences.update(missing)
+
+        return preferences
+
+    def _recommend(self, user_ids):
+        preferences = self._get_preferences(user_ids)
+
+        ratings = self.recommendation_system.get_batch_profile_recommendations(
+            profiles=[preferences[user_id].get_profile() for user_id in user_ids]
+        )
+
+        return list(zip(user_ids, ratings))
+
+    def _recommend_in_thread(self, user_ids):
+        try:
+            return self._recommend(user_ids)
+        finally:
+            connection.close()
+
+    def _save_ratings(self, ratings):
+        room_ids = set(room_id for user_ratings in ratings.values() for room_id in user_ratings)
+
+        with transaction.atomic():
+            room_ids = set(Room.objects.filter(id__in=room_ids).values_list("id", flat=True))
+
+            Recommendation.objects.filter(owner__in=ratings.keys()).delete()
+            Recommendation.objects.bulk_create([
+                Recommendation(owner_id=user_id, room_id=room_id, rating=rating)
+                for user_id, user_ratings in ratings.items()
+                for room_id, rating in user_ratings.items()
+                if room_id in room_ids
+            ])
+
+    def _save_snapshot(self):
+        directory = settings.RECOMMENDATION_SYSTEM["SNAPSHOT_DIR"]
+
+        if directory is not None:
+            self.recommendation_system.save(directory)
+
+    def train(self):
+        self.recommendation_system.train(rooms=get_rooms_data())
+        self._save_snapshot()
+
+    def update_rooms(self, rooms, removed):
+        if self.recommendation_system.update_rooms(rooms=rooms, removed=removed):
+            self._save_snapshot()
+
+    def update_users(self, user_ids=None):
+        snapshot = self.recommendation_system.snapshot
+        users = self._get_active_users(user_ids)
+
+        if snapshot is None or len(snapshot.ids) < 5:
+            ratings = {user_id: dict() for user_id in users}
+        else:
+            batches = [users[i:i + self.batch_size] for i in range(0, len(users), self.batch_size)]
+
+            if self._executor is None:
+                results = map(self._recommend, batches)
+            else:
+                results = self._executor.map(self._recommend_in_thread, batches)
+
+            ratings = dict(rating for result in results for rating in result)
+
+        self._save_ratings(ratings)
+
+        return len(ratings)
+
+    async def _receive(self, channel_layer, timeout):
+        try:
+            return await asyncio.wait_for(channel_layer.receive(RecommendationUtils.channel), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def run(self):
+        channel_layer = get_channel_layer()
+        loop = asyncio.get_running_loop()
+
+        snapshot = await sync_to_async(lambda: self.recommendation_system.snapshot)()
+        deadline = loop.time() if snapshot is None else loop.time() + self.interval
+
+        while True:
+            if loop.time() >= deadline:
+                await sync_to_async(self.train)()
+                await sync_to_async(self.update_users)()
+
+                deadline = loop.time() + self.interval
+
+            event = await self._receive(channel_layer, timeout=deadline - loop.time())
+
+            if event is None:
+                continue
+
+            rooms, removed, users = dict(), set(), set()
+
+            while event is not None:
+                if event["type"] == "recommendations.rooms":
+                    for room in event["rooms"]:
+                        rooms[room["id"]] = room
+                        removed.discard(room["id"])
+
+                    for room_id in event["removed"]:
+                        rooms.pop(room_id, None)
+                        removed.add(room_id)
+                elif event["type"] == "recommendations.users":
+                    users.update(event["users"])
+
+                event = await self._receive(channel_layer, timeout=self.delay)
+
+            if len(rooms) != 0 or len(removed) != 0:
+                await sync_to_async(self.update_rooms)(rooms=list(rooms.values()), removed=removed)
+                await sync_to_async(self.update_users)()
+            else:
+                await sync_to_async(self.update_users)(user_ids=users)
+
+
+class RetentionWorker:
+
+    def __init__(self, interval=None, batch_size=None):
+        config = settings.NOTIFICATION_RETENTION
+
+        self.interval = interval if interval is not None else config["INTERVAL"]
+        self.batch_size = batch_size if batch_size is not None else config["BATCH_SIZE"]
+        self.retention = {
+            notification_type: config["TYPES"].get(notification_type.name, config["DEFAULT"])
+            for notification_type in Notification.NotificationType
+        }
+
+    def _purge_type(self, notification_type, cutoff):
+        purged, batches = 0, 0
+
+        while True:
+            ids = list(
+                Notification.objects.filter(notification_type=notification_type, created_at__lt=cutoff)
+                .order_by("created_at")
+                .values_list("id", flat=True)[:self.batch_size]
+            )
+
+            if len(ids) == 0:
+                return purged, batches
+
+            purged += Notification.objects.filter(id__in=ids).delete()[0]
+            batches += 1
+
+    def purge(self):
+        start = time.perf_counter()
+        now = timezone.now()
+
+        metrics = {
+            "purged": 0,
+            "batches": 0,
+            "types": dict()
+        }
+
+        for notification_type, retention in self.retention.items():
+            purged, batches = self._purge_type(notification_type, cutoff=now - retention)
+
+            metrics["purged"] += purged
+            metrics["batches"] += batches
+            metrics["types"][notification_type.label] = purged
+
+        metrics["seconds"] = time.perf_counter() - start
+
+        return metrics
+
+    async def run(self, report=None):
+        while True:
+            metrics = await sync_to_async(self.purge)()
+
+            if report is not None:
+                report(metrics)
+
+            await asyncio.sleep(self.interval)
@@ -74,6 +74,11 @@ if DEBUG:
             "BACKEND": "channels.layers.InMemoryChannelLayer",
         }
     }
+    ROOM_STATE = {
+        "BACKEND": "memory",
+        "TTL": 86400,
+        "OPTIONS": {},
+    }
 else:
     REDIS_PASSWORD = config("REDIS_PASSWORD", default="")
     REDIS_HOST = config("REDIS_HOST", default="localhost")
@@ -89,6 +94,46 @@ else:
             },
         },
     }
+    ROOM_STATE = {
+        "BACKEND": "redis",
+        "TTL": 86400,
+        "OPTIONS": {
+            "url": f"redis://:{REDIS_PASSWORD}@{REDIS_HOST}:{REDIS_PORT}/1",
+        },
+    }
+
+WEBSOCKET_DISPATCH = {
+    "MODE": config("WEBSOCKET_DISPATCH_MODE", default="background"),
+    "BATCH_SIZE": 100,
+    "ROOM_LIST_WINDOW": 0.5,
+    "ROOM_LIST_SNAPSHOT_SIZE": 20,
+}
+
+RECOMMENDATION_SYSTEM = {
+    "NUMBER_OF_RECOMMENDATIONS": 3,
+    "BACKEND": config("RECOMMENDATION_BACKEND", default="brute"),
+    "BACKEND_OPTIONS": {},
+    "HALF_LIFE": timedelta(days=14),
+    "MIN_PREFERENCE_WEIGHT": 0.01,
+    "SNAPSHOT_DIR": config("RECOMMENDATION_SNAPSHOT_DIR", default=str(SERVER_DIR / "snapshots")) or None,
+    "UPDATE_INTERVAL": 300,
+    "UPDATE_DELAY": 1,
+    "WORKERS": 4,
+    "BATCH_SIZE": 500,
+}
+
+NOTIFICATION_RETENTION = {
+    "DEFAULT": timedelta(days=7),
+    "TYPES": {
+        "MENTION": timedelta(days=7),
+        "REPORT": timedelta(days=7),
+        "WARNING": timedelta(days=7),
+        "MESSAGE_REPLY": timedelta(days=7),
+        "STATUS_CHANGE": timedelta(days=7),
+    },
+    "BATCH_SIZE": 1000,
+    "INTERVAL": 3600,
+}
 
 WSGI_APPLICATION = "core.wsgi.application"
 
@@ -151,7 +196,7 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "core.server.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_RENDERER_CLASSES": [
         "rest_framework.renderers.JSONRenderer",
@@ -192,6 +237,11 @@ SIMPLE_JWT = {
     "SLIDING_TOKEN_REFRESH_LIFETIME": timedelta(days=3),
 }
 
+TOKEN_CACHE = {
+    "MAX_SIZE": 10000,
+    "TTL": 300,
+}
+
 LANGUAGE_CODE = "en-us"
 
 TIME_ZONE = "UTC"
@@ -8,6 +8,7 @@ const ENDPOINTS = {
   profile: '/api/profile/',
   notifications: '/api/notifications/',
   notification: '/api/notification/',
+  unreadNotifications: '/api/unread-notifications/',
   users: '/api/users/',
   user: '/api/user/',
   reports: '/api/reports/',
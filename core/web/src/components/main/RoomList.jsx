@@ -56,7 +56,7 @@ const RoomList = ({ editable }) => {
   const underMd = useMediaQuery((theme) => theme.breakpoints.down('md'));
 
   const {
-    loading, loadingRoomList, roomList, notFound, deleteRoom, filterLoading,
+    loading, loadingRoomList, roomList, roomSummaries, notFound, deleteRoom, filterLoading,
   } = useRoomList();
 
   const [selectedRoom, setSelectedRoom] = useState(null);
@@ -340,6 +340,7 @@ const RoomList = ({ editable }) => {
                     <ButtonGroup variant="contained" sx={{ minWidth: editable ? 150 : 100 }}>
                       <Button
                         disabled={room.number_of_participants === room.participants.length
+                           || roomSummaries[room.id]?.is_available === false
                            || room.participants.map((user) => user.id).includes(profile.id)}
                         onClick={() => handleOnJoin(room)}
                         endIcon={room.key.length !== 0 && profile.id !== room.host.id && <Lock />}
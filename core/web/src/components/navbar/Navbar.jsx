@@ -38,7 +38,15 @@ import './Navbar.scss';
 
 const Navbar = () => {
   const {
-    profile, logout, notifications, viewNotification, viewAll,
+    profile,
+    logout,
+    notifications,
+    unread,
+    hasMoreNotifications,
+    refreshNotifications,
+    loadMoreNotifications,
+    viewNotification,
+    viewAll,
   } = useAuth();
 
   const underSm = useMediaQuery(useTheme().breakpoints.down('sm'));
@@ -50,7 +58,10 @@ const Navbar = () => {
   const handleOnLogout = () => logout();
 
   const [anchorElNotification, setAnchorElNotification] = useState(null);
-  const handleOpenNotificationMenu = (event) => setAnchorElNotification(event.currentTarget);
+  const handleOpenNotificationMenu = (event) => {
+    setAnchorElNotification(event.currentTarget);
+    refreshNotifications();
+  };
   const handleCloseNotificationMenu = () => setAnchorElNotification(null);
 
   return (
@@ -97,9 +108,7 @@ const Navbar = () => {
               <IconButton onClick={handleOpenNotificationMenu} sx={{ color: styles.color_white }}>
                 <Badge
                   max={9}
-                  badgeContent={notifications.filter(
-                    (notification) => !notification.is_viewed,
-                  ).length}
+                  badgeContent={unread}
                   color="primary"
                 >
                   <Notifications sx={{ color: styles.color_white }} />
@@ -125,7 +134,7 @@ const Navbar = () => {
                 }}
                 sx={{ mt: 2 }}
               >
-                {notifications.filter((notification) => !notification.is_viewed).length ? (
+                {unread ? (
                   <>
                     <Typography
                       component="span"
@@ -139,9 +148,7 @@ const Navbar = () => {
                     >
                       <span>View all</span>
                       <IconButton
-                        onClick={() => viewAll(notifications.filter(
-                          (notification) => !notification.is_viewed,
-                        ))}
+                        onClick={viewAll}
                         sx={{ ml: 0.5 }}
                       >
                         <Visibility sx={{ color: styles.color_neon }} />
@@ -171,6 +178,13 @@ const Navbar = () => {
                       <span>No notifications</span>
                     </Typography>
                   )}
+                {hasMoreNotifications && (
+                  <Typography textAlign="center" sx={{ p: 1 }}>
+                    <Link component="button" underline="none" onClick={loadMoreNotifications}>
+                      Show more
+                    </Link>
+                  </Typography>
+                )}
               </Popover>
               {profile.is_staff && (
               <Link
@@ -44,7 +44,7 @@ const Chat = () => {
   const { profile } = useAuth();
 
   const {
-    messages, sendMessage, editMessage, deleteMessage,
+    messages, loadOlderMessages, sendMessage, editMessage, deleteMessage,
   } = useRoom();
 
   const messagesRef = useRef(null);
@@ -56,6 +56,13 @@ const Chat = () => {
     }
   }, [messages]);
 
+  const handleScroll = () => {
+    const messagesElement = messagesRef.current;
+    if (messagesElement.scrollHeight + messagesElement.scrollTop - messagesElement.clientHeight < 64) {
+      loadOlderMessages();
+    }
+  };
+
   const [selectedMessage, setSelectedMessage] = useState(null);
   const [type, setType] = useState(null);
 
@@ -200,6 +207,7 @@ const Chat = () => {
         )}
         <Box
           ref={messagesRef}
+          onScroll={handleScroll}
           sx={{
             display: 'flex',
             flexDirection: 'column-reverse',
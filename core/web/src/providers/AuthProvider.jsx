@@ -3,6 +3,7 @@ import React, {
   useContext,
   useEffect,
   useMemo,
+  useState,
 } from 'react';
 import { Navigate, Outlet, useNavigate } from 'react-router-dom';
 
@@ -97,13 +98,30 @@ const AuthProvider = ({ children }) => {
     }
   };
 
-  const [{ loading: loadingNotifications, data: notifications }, refetchNotifications] = useAxios(
+  const [{ loading: loadingNotifications, data: notificationList }, refetchNotifications] = useAxios(
     {
       url: ENDPOINTS.notifications,
       method: 'GET',
     },
   );
 
+  const [{ data: unreadNotifications }, refetchUnreadNotifications] = useAxios(
+    {
+      url: ENDPOINTS.unreadNotifications,
+      method: 'GET',
+    },
+  );
+
+  const [{ loading: loadingMoreNotifications }, fetchMoreNotifications] = useAxios(
+    {
+      method: 'GET',
+    },
+    {
+      manual: true,
+      autoCancel: false,
+    },
+  );
+
   const [, updateNotification] = useAxios(
     {
       method: 'PATCH',
@@ -114,6 +132,40 @@ const AuthProvider = ({ children }) => {
     },
   );
 
+  const [notifications, setNotifications] = useState([]);
+  const [nextNotifications, setNextNotifications] = useState(null);
+  const [unread, setUnread] = useState(0);
+  const [isNotificationListStale, setIsNotificationListStale] = useState(false);
+
+  useEffect(() => {
+    if (!loadingNotifications && notificationList) {
+      setNotifications(notificationList.results);
+      setNextNotifications(notificationList.next);
+      setIsNotificationListStale(false);
+    }
+  }, [loadingNotifications, notificationList]);
+
+  useEffect(() => {
+    if (unreadNotifications) {
+      setUnread(unreadNotifications.unread);
+    }
+  }, [unreadNotifications]);
+
+  const refreshNotifications = async () => {
+    if (isNotificationListStale) {
+      await refetchNotifications();
+    }
+  };
+
+  const loadMoreNotifications = async () => {
+    if (!nextNotifications || loadingMoreNotifications) {
+      return;
+    }
+    const response = await fetchMoreNotifications({ url: nextNotifications });
+    setNotifications((currentNotifications) => [...currentNotifications, ...response.data.results]);
+    setNextNotifications(response.data.next);
+  };
+
   const viewNotification = async (notification) => {
     const formData = {
       is_viewed: true,
@@ -122,26 +174,34 @@ const AuthProvider = ({ children }) => {
       url: `${ENDPOINTS.notification}${notification}/`,
       data: formData,
     });
-    await refetchNotifications();
+    setNotifications((currentNotifications) => currentNotifications.map(
+      (currentNotification) => (currentNotification.id === notification
+        ? { ...currentNotification, is_viewed: true }
+        : currentNotification),
+    ));
+    setUnread((currentUnread) => Math.max(currentUnread - 1, 0));
   };
 
-  const viewAll = async (toView) => {
-    const formData = {
-      is_viewed: true,
-    };
-    const promises = toView.map((notification) => updateNotification({
-      url: `${ENDPOINTS.notification}${notification.id}/`,
-      data: formData,
-    }));
-    await Promise.all(promises);
-    await refetchNotifications();
+  const viewAll = async () => {
+    await updateNotification({
+      url: ENDPOINTS.notifications,
+      data: { all: true },
+      headers: {
+        'Content-Type': 'application/json',
+      },
+    });
+    setNotifications((currentNotifications) => currentNotifications.map(
+      (currentNotification) => ({ ...currentNotification, is_viewed: true }),
+    ));
+    await refetchUnreadNotifications();
   };
 
   useEffect(() => {
     socket.onmessage = async (message) => {
       const data = JSON.parse(message.data);
       if (data.type === 'notification_list_update') {
-        await refetchNotifications();
+        setUnread(data.unread);
+        setIsNotificationListStale(true);
       } else if (data.type === 'ban') {
         window.location.reload();
       }
@@ -162,14 +222,28 @@ const AuthProvider = ({ children }) => {
     resetPassword,
     loadingNotifications,
     notifications,
+    unread,
+    hasMoreNotifications: Boolean(nextNotifications),
     refetchNotifications,
+    refreshNotifications,
+    loadMoreNotifications,
     viewNotification,
     viewAll,
-  }), [loading, loadingProfile, profile, loadingNotifications, notifications]);
+  }), [
+    loading,
+    loadingProfile,
+    profile,
+    loadingNotifications,
+    notifications,
+    unread,
+    nextNotifications,
+    loadingMoreNotifications,
+    isNotificationListStale,
+  ]);
 
   return (
     <AuthContext.Provider value={value}>
-      {(loadingProfile && !profile) || (loadingNotifications && !notifications)
+      {(loadingProfile && !profile) || (loadingNotifications && !notificationList)
         ? (
           <div
             style={{
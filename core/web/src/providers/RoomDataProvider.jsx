@@ -75,13 +75,13 @@ const RoomListProvider = ({ children }) => {
     },
   );
 
-  const [pageCount, setPageCount] = useState(0);
+  const [rooms, setRooms] = useState(roomList);
   useEffect(() => {
-    if (roomList) {
-      setPageCount(Math.ceil(roomList.count / 5));
-    }
+    setRooms(roomList);
   }, [roomList]);
 
+  const [pageCount, setPageCount] = useState(0);
+
   const notFound = (username !== undefined ? 'User hasn\'t created any room yet :(' : 'No rooms were found :(');
 
   const [{ loading }, execute] = useAxios(
@@ -152,9 +152,6 @@ const RoomListProvider = ({ children }) => {
         await removeTags(toRemove);
         await addTags(toAdd.map((tag) => ({ room: roomInstance.id, name: tag })));
       }
-      socket.send(JSON.stringify({
-        type: 'room_list_update',
-      }));
       const tagsByRoom = await getTagsByRoom(roomInstance);
       response.data.room.tags = tagsByRoom;
       setRoom(response.data.room);
@@ -180,29 +177,126 @@ const RoomListProvider = ({ children }) => {
     toast(`The «${roomInstance.title}» room has been removed.`, { type: 'success' });
   };
 
-  const [preventFilterLoading, setPreventFilterLoading] = useState(false);
+  const [, fetchRoom] = useAxios(
+    {
+      method: 'GET',
+    },
+    {
+      manual: true,
+      autoCancel: false,
+    },
+  );
+
+  const getRoom = async (roomTitle) => {
+    try {
+      const response = await fetchRoom({
+        url: `${ENDPOINTS.room}${roomTitle}/`,
+      });
+      return response.data;
+    } catch (err) {
+      return null;
+    }
+  };
+
+  const [roomSummaries, setRoomSummaries] = useState({});
+  const [snapshotCursor, setSnapshotCursor] = useState(null);
+
+  useEffect(() => {
+    if (snapshotCursor !== null && rooms && rooms.results.some((room) => room.id < snapshotCursor)) {
+      socket.send(JSON.stringify({ type: 'room_list_snapshot', cursor: snapshotCursor }));
+      setSnapshotCursor(null);
+    }
+  }, [socket, rooms, snapshotCursor]);
+
+  const applyRoomListUpdate = async (data) => {
+    setRoomSummaries((currentSummaries) => {
+      const summaries = { ...currentSummaries };
+      data.created.forEach((room) => {
+        summaries[room.id] = room;
+      });
+      [...data.updated, ...data.participants].forEach((room) => {
+        if (summaries[room.id]) {
+          summaries[room.id] = { ...summaries[room.id], ...room };
+        }
+      });
+      data.deleted.forEach((id) => {
+        delete summaries[id];
+      });
+      return summaries;
+    });
+
+    const visible = rooms ? rooms.results : [];
+    const reopened = data.updated.filter((delta) => delta.is_open !== undefined
+      && visible.some((room) => room.id === delta.id));
+    const fetched = await Promise.all(reopened.map((delta) => getRoom(delta.title
+      || visible.find((room) => room.id === delta.id).title)));
+
+    const created = searchParams.toString().length === 0 && username === undefined
+      ? (await Promise.all(data.created.map((room) => getRoom(room.title)))).filter((room) => room !== null)
+      : [];
+
+    setRooms((currentRooms) => {
+      if (!currentRooms) {
+        return currentRooms;
+      }
+      const results = currentRooms.results
+        .filter((room) => !data.deleted.includes(room.id))
+        .map((room) => {
+          const updated = data.updated.find((delta) => delta.id === room.id);
+          const participants = data.participants.find((delta) => delta.id === room.id);
+          const refreshed = fetched.find((instance) => instance && instance.id === room.id);
+          return {
+            ...room,
+            ...updated,
+            ...(participants && { participants: participants.participants }),
+            ...refreshed,
+          };
+        });
+      const removed = currentRooms.results.length - results.length;
+      if (created.length !== 0) {
+        const recommended = results.filter((room) => room.recommendation_rating > 0);
+        const others = results.filter((room) => !(room.recommendation_rating > 0));
+        results.splice(0, results.length, ...recommended, ...created, ...others);
+        results.splice(5);
+      }
+      return {
+        ...currentRooms,
+        count: currentRooms.count - removed + created.length,
+        results,
+      };
+    });
+  };
 
   useEffect(() => {
     socket.onmessage = async (message) => {
       const data = JSON.parse(message.data);
-      if (data.type === 'room_list_update') {
-        setPreventFilterLoading(true);
-        await refetchRoomList();
-        setPreventFilterLoading(false);
+      if (data.type === 'room_list_snapshot') {
+        setRoomSummaries((currentSummaries) => ({
+          ...(data.cursor !== null && currentSummaries),
+          ...Object.fromEntries(data.rooms.map((room) => [room.id, room])),
+        }));
+        setSnapshotCursor(data.next);
+      } else if (data.type === 'room_list_update') {
+        await applyRoomListUpdate(data);
       }
     };
-    return () => {
-      socket.close();
-    };
+  });
+
+  useEffect(() => () => {
+    socket.close();
   }, [socket]);
 
   const [filterLoading, setFilterLoading] = useState(false);
 
   useEffect(() => {
-    if (!preventFilterLoading) {
-      setFilterLoading(loadingRoomList);
+    setFilterLoading(loadingRoomList);
+  }, [loadingRoomList]);
+
+  useEffect(() => {
+    if (rooms) {
+      setPageCount(Math.ceil(rooms.count / 5));
     }
-  }, [loadingRoomList, preventFilterLoading]);
+  }, [rooms]);
 
   const value = useMemo(() => ({
     socket,
@@ -211,8 +305,9 @@ const RoomListProvider = ({ children }) => {
     loadingRoomOptions,
     roomOptions,
     loadingRoomList,
-    roomList,
+    roomList: rooms,
     refetchRoomList,
+    roomSummaries,
     loadingTagList,
     tagList,
     pageCount,
@@ -228,7 +323,8 @@ const RoomListProvider = ({ children }) => {
     loadingRoomOptions,
     roomOptions,
     loadingRoomList,
-    roomList,
+    rooms,
+    roomSummaries,
     pageCount,
     loading,
     filterLoading,
@@ -311,7 +407,18 @@ const RoomProvider = ({ children }) => {
     }));
   };
 
+  const [{ loading: loadingOlderMessageList }, fetchOlderMessageList] = useAxios(
+    {
+      method: 'GET',
+    },
+    {
+      manual: true,
+      autoCancel: false,
+    },
+  );
+
   const [messages, setMessages] = useState(null);
+  const [previousMessages, setPreviousMessages] = useState(null);
 
   const sendMessage = async (form) => {
     await execute({
@@ -335,9 +442,19 @@ const RoomProvider = ({ children }) => {
     });
   };
 
+  const loadOlderMessages = async () => {
+    if (!previousMessages || loadingOlderMessageList) {
+      return;
+    }
+    const response = await fetchOlderMessageList({ url: previousMessages });
+    setMessages((currentMessages) => [...response.data.results, ...currentMessages]);
+    setPreviousMessages(response.data.previous);
+  };
+
   useEffect(() => {
     if (!loadingMessageList) {
-      setMessages(messageList);
+      setMessages(messageList?.results);
+      setPreviousMessages(messageList?.previous ?? null);
     }
   }, [loadingMessageList, messageList]);
 
@@ -641,6 +758,7 @@ const RoomProvider = ({ children }) => {
     fetchRoom,
     kickUser,
     messages,
+    loadOlderMessages,
     sendMessage,
     editMessage,
     deleteMessage,
@@ -649,7 +767,7 @@ const RoomProvider = ({ children }) => {
     connectToVoiceChat,
     toggleMic,
     disconnectFromVoiceChat,
-  }), [loading, room, messages, voiceChatUsers, isMuted]);
+  }), [loading, room, messages, previousMessages, loadingOlderMessageList, voiceChatUsers, isMuted]);
 
   return (
     <RoomContext.Provider value={value}>